@@ -0,0 +1,155 @@
+"""Пул headless-Firefox для поиска через duckduckgo.com."""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterator, Optional
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+POOL_SIZE = int(os.getenv("AI_SCOUT_BROWSERS", "2"))
+MAX_USES = 25             # после стольких запросов драйвер пересоздаём
+LEASE_TIMEOUT = 120       # сек ожидания свободного браузера
+
+
+@lru_cache(maxsize=None)
+def gecko_path() -> str:
+    """Путь к geckodriver (скачивается/ищется один раз за процесс)."""
+    from webdriver_manager.firefox import GeckoDriverManager
+
+    return GeckoDriverManager().install()
+
+
+def _new_driver() -> webdriver.Firefox:
+    from selenium import webdriver
+    from selenium.webdriver.firefox.options import Options
+    from selenium.webdriver.firefox.service import Service
+
+    options = Options()
+    options.add_argument("-headless")
+    return webdriver.Firefox(service=Service(gecko_path()), options=options)
+
+
+def _quit(driver: webdriver.Firefox) -> None:
+    try:
+        driver.quit()
+    except Exception as exc:  # noqa: BLE001
+        logging.debug("driver.quit() failed: %s", exc)
+
+
+def _healthy(driver: webdriver.Firefox) -> bool:
+    from selenium.common.exceptions import WebDriverException   # драйвер есть — selenium уже загружен
+
+    try:
+        driver.current_url          # дешёвый round-trip до geckodriver
+        return True
+    except WebDriverException:
+        return False
+
+
+class DriverPool:
+    """Ограниченный пул Firefox-драйверов с проверкой здоровья и ротацией."""
+
+    def __init__(self, size: int = POOL_SIZE, max_uses: int = MAX_USES) -> None:
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self._idle: list[webdriver.Firefox] = []     # свободные, последний — самый «тёплый»
+        self._uses: dict[int, int] = {}
+        self._alive = 0
+        # ждущих будит и возврат драйвера, и освободившееся место (_retire)
+        self._cond = threading.Condition()
+        self._closed = False
+
+    # ── выдача / возврат ────────────────────────────────────────────
+    def _acquire(self, timeout: Optional[float]) -> webdriver.Firefox:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                while not self._idle and self._alive >= self.size:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"нет свободного Firefox за {timeout:g} с "
+                                           f"(пул на {self.size})")
+                    self._cond.wait(remaining)
+                driver = self._idle.pop() if self._idle else None
+                if driver is None:
+                    self._alive += 1
+            if driver is None:
+                return self._spawn()
+
+            if _healthy(driver):
+                return driver
+            logging.info("Firefox driver is unhealthy, replacing it")
+            self._retire(driver)
+
+    def _spawn(self) -> webdriver.Firefox:
+        try:
+            driver = _new_driver()
+        except Exception:
+            with self._cond:
+                self._alive -= 1
+                self._cond.notify()
+            raise
+        self._uses[id(driver)] = 0
+        return driver
+
+    def _retire(self, driver: webdriver.Firefox) -> None:
+        self._uses.pop(id(driver), None)
+        with self._cond:
+            self._alive -= 1
+            self._cond.notify()                 # место свободно — ждущий запустит новый
+        _quit(driver)
+
+    def _release(self, driver: webdriver.Firefox, broken: bool) -> None:
+        uses = self._uses.get(id(driver), 0) + 1
+        self._uses[id(driver)] = uses
+        if broken or self._closed or uses >= self.max_uses:
+            self._retire(driver)
+        else:
+            with self._cond:
+                self._idle.append(driver)
+                self._cond.notify()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = LEASE_TIMEOUT) -> Iterator[webdriver.Firefox]:
+        """Выдаёт драйвер на время ``with``-блока."""
+        from selenium.common.exceptions import WebDriverException
+
+        driver = self._acquire(timeout)
+        broken = False
+        try:
+            yield driver
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self._release(driver, broken)
+
+    def close(self) -> None:
+        """Закрывает все свободные браузеры; занятые закроются при возврате."""
+        self._closed = True
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._retire(driver)
+
+
+_pool: Optional[DriverPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> DriverPool:
+    """Общий на процесс пул (создаётся при первом обращении)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            atexit.register(_pool.close)
+        return _pool
@@ -3,37 +3,37 @@
 from __future__ import annotations
 
 import logging
+import os
+import threading
 from dataclasses import dataclass
-from typing import List, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from urllib.parse import urldefrag
 
-from .utils import extract_json
+from .utils import bounded_map, extract_json, HEADERS
+from . import download, llm_cache, metrics, prefilter, ratelimit, search
 
-import pandas as pd
-from duckduckgo_search import DDGS
-from langchain_openai import OpenAI
-
-# from langchain.llms import OpenAI
-from langchain.prompts import PromptTemplate
-import requests_cache
 import trafilatura
 
+if TYPE_CHECKING:                    # pandas и langchain грузятся при первом вызове
+    import pandas as pd
+
+CASE_WORKERS = int(os.getenv("AI_SCOUT_CASE_WORKERS", "8"))      # загрузка+разбор на организацию
+CASE_LLM_WORKERS = int(os.getenv("AI_SCOUT_CASE_LLM", "4"))      # вызовов LLM на процесс
+CASE_TEXT_CHARS = 4_000              # сколько текста страницы уходит в LLM
+
+_llm_slots = threading.BoundedSemaphore(max(1, CASE_LLM_WORKERS))
+
 PROMPT_CASE_FILTER = """
 Определи, описывает ли текст веб-страницы {text} успешный кейс применения
 искусственного интеллекта в научных исследованиях.
 Ответ JSON: {{ "is_ai_case": bool, "task": "", "ai_method": "", "kpi": "" }}
 """
 
-requests_cache.install_cache("ai_scout_cache")
-
 
 def search_duckduckgo(query: str, max_results: int = 10) -> List[str]:
-    """Простой поиск ссылок. TODO: заменить на Perplexity API."""
-    links: List[str] = []
-    with DDGS() as ddgs:
-        for r in ddgs.text(query, max_results=max_results):
-            if r.get("href"):
-                links.append(r["href"])
-    return links
+    """Простой поиск ссылок (общий кэширующий клиент). TODO: заменить на Perplexity API."""
+    return search.search(query, max_results=max_results)
 
 
 @dataclass
@@ -48,21 +48,37 @@ class AICase:
     url: str  # ссылка на источник
 
 
-def analyze_url(url: str, topic_id: int, org: str) -> Optional[AICase]:
-    """Анализируем страницу на предмет AI-кейса."""
+@lru_cache(maxsize=1)
+def _case_chain() -> Tuple[Any, Any]:
+    """Промпт и LLM классификатора — один раз на процесс (клиент потокобезопасен)."""
+    from langchain.prompts import PromptTemplate
+    from langchain_openai import OpenAI
+
+    prompt = PromptTemplate(template=PROMPT_CASE_FILTER, input_variables=["text"])
+    return prompt, OpenAI(temperature=0)
+
+
+def _fetch_case_text(url: str) -> str:
+    """Текст страницы ('' — не скачалась или не HTML)."""
     try:
-        html = trafilatura.fetch_url(url)
-        if not html:
-            return None
-        text = trafilatura.extract(html) or ""
+        key = ratelimit.host_key(url)
+        ratelimit.wait(key)
+        page = download.fetch(url, headers=HEADERS)
+        ratelimit.check_status(key, page.status, page.headers)
+        if not page.ok or not page.body:
+            return ""
+        with metrics.span("extract"):
+            return trafilatura.extract(page.body) or ""
     except Exception as exc:  # noqa: BLE001
         logging.warning("Failed to fetch case %s: %s", url, exc)
-        return None
+        return ""
 
-    llm = OpenAI(temperature=0)
-    prompt = PromptTemplate(template=PROMPT_CASE_FILTER, input_variables=["text"])
-    chain = prompt | llm
-    result = chain.invoke({"text": text[:4000]})  # ответ от LLM
+
+def _classify(text: str, url: str, topic_id: int, org: str) -> Optional[AICase]:
+    """Запрос к LLM: описывает ли текст AI-кейс."""
+    prompt, llm = _case_chain()
+    with _llm_slots:
+        result = llm_cache.cached_invoke(prompt, llm, {"text": text[:CASE_TEXT_CHARS]})
 
     data = extract_json(result)
     if data.get("is_ai_case"):
@@ -80,13 +96,43 @@ def analyze_url(url: str, topic_id: int, org: str) -> Optional[AICase]:
     return None
 
 
-def gather_ai_cases(org: str, tasks: List[str], max_results: int = 5) -> pd.DataFrame:
+def analyze_url(url: str, topic_id: int, org: str) -> Optional[AICase]:
+    """Анализируем страницу на предмет AI-кейса."""
+    text = _fetch_case_text(url)[:CASE_TEXT_CHARS]
+    if not text:
+        return None
+    flt = prefilter.get_filter()
+    decision = flt.decide(text)
+    if not decision.call_llm:
+        return None
+    case = _classify(text, url, topic_id, org)
+    flt.record(decision, case is not None)
+    return case
+
+
+def _unique_urls(hits: List[List[str]]) -> Dict[str, int]:
+    """URL → первая задача, под которой он нашёлся (порядок сохраняется)."""
+    first: Dict[str, int] = {}
+    for topic_id, urls in enumerate(hits):
+        for url in urls:
+            first.setdefault(urldefrag(url)[0], topic_id)
+    return first
+
+
+def gather_ai_cases(org: str, tasks: List[str], max_results: int = 5,
+                    workers: int = CASE_WORKERS) -> pd.DataFrame:
     """Ищем AI-кейсы, относящиеся к задачам."""
-    cases: List[AICase] = []
-    for i, task in enumerate(tasks):
-        query = f"{org} {task} AI case study"  # поисковый запрос
-        for url in search_duckduckgo(query, max_results=max_results):
-            case = analyze_url(url, topic_id=i, org=org)
-            if case:
-                cases.append(case)
+    import pandas as pd
+
+    queries = [f"{org} {task} AI case study" for task in tasks]  # поисковые запросы
+    hits = list(bounded_map(lambda q: search_duckduckgo(q, max_results=max_results),
+                            queries, workers))
+    urls = _unique_urls(hits)
+    found = sum(len(h) for h in hits)
+    if found > len(urls):
+        metrics.add("case_url_duplicate", found - len(urls))
+        logging.info("%s: %d of %d case URLs are duplicates", org, found - len(urls), found)
+
+    cases = [case for case in bounded_map(lambda item: analyze_url(item[0], item[1], org),
+                                          urls.items(), workers) if case]
     return pd.DataFrame([c.__dict__ for c in cases])
@@ -0,0 +1,139 @@
+"""Нарезка длинного текста на куски для LLM по бюджету токенов."""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Iterable, Iterator, Tuple, Union
+
+import tiktoken
+
+CHUNK_TOKENS = 12_000          # целевой размер куска
+PROMPT_RESERVE = 6_000         # системный промпт + PROMPT_INFO + ответ функции
+MODEL_CONTEXT = {
+    "gpt-4o-mini": 128_000,
+    "gpt-4o": 128_000,
+    "gpt-4.1-mini": 1_000_000,
+    "gpt-4-turbo": 128_000,
+    "gpt-3.5-turbo": 16_385,
+    "gpt-3.5-turbo-instruct": 4_096,
+}
+DEFAULT_CONTEXT = 16_385
+CHARS_PER_TOKEN = 3            # грубая оценка, если словарь tiktoken недоступен
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+_LINE = re.compile(r"[^\n]+")
+
+Source = Union[str, Iterable[str]]
+_Unit = Tuple[str, int, str]       # текст, токены, разделитель перед ним
+
+
+class _ApproxEncoding:
+    """Замена tiktoken без сети: «токен» = CHARS_PER_TOKEN символов."""
+
+    def encode(self, text: str, **_) -> list[str]:
+        return [text[i:i + CHARS_PER_TOKEN] for i in range(0, len(text), CHARS_PER_TOKEN)]
+
+    def decode(self, tokens: list[str]) -> str:
+        return "".join(tokens)
+
+
+@lru_cache(maxsize=None)
+def encoder(model: str) -> "tiktoken.Encoding":
+    # tiktoken скачивает словарь при первом обращении — в закрытом контуре
+    # это падает, поэтому считаем токены приблизительно
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as exc:  # noqa: BLE001
+        logging.warning("tiktoken unavailable (%s), using approximate token counts", exc)
+        return _ApproxEncoding()
+
+
+def count_tokens(text: str, model: str) -> int:
+    return len(encoder(model).encode(text, disallowed_special=()))
+
+
+def token_budget(model: str, max_tokens: int = CHUNK_TOKENS) -> int:
+    """Сколько токенов текста можно положить в один запрос к ``model``."""
+    context = MODEL_CONTEXT.get(model, DEFAULT_CONTEXT)
+    return max(256, min(max_tokens, context - PROMPT_RESERVE))
+
+
+def iter_paragraphs(source: Source) -> Iterator[str]:
+    """Непустые строки текста или файла — без ``str.split`` всего текста."""
+    lines = (m.group(0) for m in _LINE.finditer(source)) if isinstance(source, str) else source
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def _units(source: Source, model: str, budget: int) -> Iterator[_Unit]:
+    """Абзацы; длинные — предложениями; гигантские предложения — по токенам."""
+    enc = encoder(model)
+    for para in iter_paragraphs(source):
+        n = count_tokens(para, model)
+        if n <= budget:
+            yield para, n, "\n"
+            continue
+
+        sep = "\n"
+        for sent in _SENTENCE_END.split(para):
+            m = count_tokens(sent, model)
+            if m <= budget:
+                yield sent, m, sep
+            else:
+                tokens = enc.encode(sent, disallowed_special=())
+                for i in range(0, len(tokens), budget):
+                    piece = tokens[i:i + budget]
+                    yield enc.decode(piece), len(piece), sep if i == 0 else ""
+            sep = " "
+
+
+def _join(units: Iterable[_Unit]) -> str:
+    out = []
+    for text, _, sep in units:
+        if out:
+            out.append(sep)
+        out.append(text)
+    return "".join(out)
+
+
+def iter_chunks(
+    source: Source,
+    model: str = "gpt-4o-mini",
+    max_tokens: int = CHUNK_TOKENS,
+    overlap: int = 0,
+) -> Iterator[str]:
+    """
+    Лениво режет ``source`` на куски ≤ ``token_budget(model, max_tokens)`` токенов.
+    • Границы — абзацы, при необходимости предложения.
+    • ``overlap`` — сколько токенов хвоста предыдущего куска повторить
+      в начале следующего (целыми абзацами/предложениями).
+    """
+    budget = token_budget(model, max_tokens)
+    buf: deque[_Unit] = deque()
+    used = 0
+
+    for unit in _units(source, model, budget):
+        if buf and used + unit[1] > budget:
+            yield _join(buf)
+            kept: deque[_Unit] = deque()
+            kept_tokens = 0
+            while buf and kept_tokens + buf[-1][1] <= overlap:
+                u = buf.pop()
+                kept.appendleft(u)
+                kept_tokens += u[1]
+            buf, used = kept, kept_tokens
+            while buf and used + unit[1] > budget:     # перекрытие не влезает
+                used -= buf.popleft()[1]
+        buf.append(unit)
+        used += unit[1]
+
+    if buf:
+        yield _join(buf)
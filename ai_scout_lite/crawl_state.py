@@ -0,0 +1,99 @@
+"""Состояние инкрементального пере-краулинга."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+STATE_PATH = "ai_scout_crawl_state.sqlite"
+
+
+@dataclass
+class PageState:
+    url:           str
+    etag:          str = ""
+    last_modified: str = ""
+    content_hash:  str = ""
+    text:          str = ""
+    links:         List[Tuple[str, str]] = field(default_factory=list)    # (URL, анкор)
+
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+class CrawlState:
+    """SQLite-хранилище :class:`PageState` (потокобезопасное)."""
+
+    def __init__(self, path: str = STATE_PATH) -> None:
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,"
+            " content_hash TEXT, text TEXT, links TEXT, fetched REAL)"
+        )
+        self._db.commit()
+
+    def get(self, url: str) -> Optional[PageState]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, content_hash, text, links FROM pages WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        links = [tuple(link) if isinstance(link, list) else (link, "")   # старые записи — без анкоров
+                 for link in json.loads(row[4] or "[]")]
+        return PageState(url, row[0] or "", row[1] or "", row[2] or "", row[3] or "", links)
+
+    def put(self, state: PageState) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (state.url, state.etag, state.last_modified, state.content_hash,
+                 state.text, json.dumps(state.links, ensure_ascii=False), time.time()),
+            )
+            self._db.commit()
+
+    @staticmethod
+    def conditional_headers(state: Optional[PageState]) -> Dict[str, str]:
+        """Заголовки условного запроса по прошлому ответу."""
+        headers: Dict[str, str] = {}
+        if state and state.etag:
+            headers["If-None-Match"] = state.etag
+        if state and state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+        return headers
+
+    @staticmethod
+    def from_response(url: str, headers, body: bytes, text: str,
+                      links: List[Tuple[str, str]]) -> PageState:
+        return PageState(
+            url=url,
+            etag=headers.get("ETag", ""),
+            last_modified=headers.get("Last-Modified", ""),
+            content_hash=content_hash(body),
+            text=text,
+            links=links,
+        )
+
+
+_store: Optional[CrawlState] = None
+
+
+def enable(path: str = STATE_PATH) -> CrawlState:
+    """Включает инкрементальный режим для всего процесса."""
+    global _store
+    if _store is None:
+        _store = CrawlState(path)
+    return _store
+
+
+def get_store() -> Optional[CrawlState]:
+    return _store
@@ -0,0 +1,250 @@
+"""Асинхронный краулер сайта организации."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urldefrag, urlparse
+
+import httpx
+
+from . import crawl_state, download, extract, metrics, ratelimit, relevance
+
+PER_HOST_LIMIT = 4        # одновременных запросов к одному хосту
+FETCH_TIMEOUT = 15        # сек на страницу
+
+
+class Frontier:
+    """Очередь ссылок с приоритетом; один и тот же URL попадает в неё ровно один раз.
+
+    ``pop`` отдаёт ссылку с наибольшим приоритетом, при равных — в порядке
+    добавления (без приоритетов это прежняя FIFO-очередь).
+    """
+
+    def __init__(self) -> None:
+        self._queue: List[Tuple[float, int, str, int]] = []    # (−приоритет, №, URL, глубина)
+        self._seen: set[str] = set()
+        self._order = itertools.count()
+
+    def push(self, url: str, priority: float = 0.0, depth: int = 0) -> bool:
+        url = urldefrag(url)[0]
+        if url in self._seen:
+            return False
+        self._seen.add(url)
+        heapq.heappush(self._queue, (-priority, next(self._order), url, depth))
+        return True
+
+    def pop(self) -> Tuple[str, int]:
+        """``(URL, глубина)`` самой ценной ссылки."""
+        _, _, url, depth = heapq.heappop(self._queue)
+        return url, depth
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+
+@dataclass
+class CrawlStats:
+    """Счётчики и время этапов одного обхода (сек)."""
+
+    pages_fetched:   int = 0
+    pages_cached:    int = 0         # 304 / тот же хэш — без разбора
+    pages_failed:    int = 0
+    pages_skipped:   int = 0         # не HTML или больше download.MAX_BYTES
+    pages_relevant:  int = 0         # касаются хотя бы одного поля OrgInfo
+    relevant_chars:  int = 0
+    stopped_early:   bool = False    # релевантного текста хватило до max_pages
+    fetch_seconds:   float = 0.0     # суммарно по всем загрузкам
+    queue_seconds:   float = 0.0     # ожидание в очереди на разбор
+    extract_seconds: float = 0.0     # CPU-время разбора в пуле
+    wall_seconds:    float = 0.0
+
+
+@dataclass
+class _Fetched:
+    url:     str
+    body:    bytes = b""
+    headers: Optional[httpx.Headers] = None
+    cached:  Optional[crawl_state.PageState] = None    # страница не менялась
+    skipped: str = ""                                  # причина отказа (download.Page)
+    queued:  float = 0.0                               # когда попала в очередь
+    depth:   int = 0                                   # уровень обхода от главной
+
+
+async def _fetch(
+    client: httpx.AsyncClient,
+    url: str,
+    limits: Dict[str, asyncio.Semaphore],
+    per_host_limit: int,
+) -> Optional[_Fetched]:
+    host = urlparse(url).netloc
+    sem = limits.setdefault(host, asyncio.Semaphore(per_host_limit))
+    store = crawl_state.get_store()
+    state = store.get(url) if store else None
+
+    async with sem:
+        key = ratelimit.host_key(url)
+        try:
+            await ratelimit.wait_async(key)
+            page = await download.fetch_async(
+                client, url, headers=crawl_state.CrawlState.conditional_headers(state))
+        except httpx.HTTPError:
+            return None
+    if page.status == 304 and state:
+        return _Fetched(url, cached=state)
+    ratelimit.check_status(key, page.status, page.headers)
+    if page.skipped:
+        return _Fetched(url, skipped=page.skipped)
+    if not page.ok:
+        return None
+
+    if state and state.content_hash == crawl_state.content_hash(page.body):
+        return _Fetched(url, cached=state)
+    return _Fetched(url, body=page.body, headers=page.headers)
+
+
+async def crawl(
+    start_url: str,
+    max_pages: int = 10,
+    min_len: int = 200,
+    page_max_chars: int = 15_000,
+    per_host_limit: int = PER_HOST_LIMIT,
+    headers: Optional[Dict[str, str]] = None,
+    stats: Optional[CrawlStats] = None,
+    enough_chars: int = relevance.ENOUGH_CHARS,
+    min_fields: int = relevance.MIN_FIELDS,
+) -> str:
+    """Асинхронная версия ``crawl_one_level``.
+
+    Текст страниц идёт в порядке обхода, т. е. от самых релевантных.
+    Собрано ``enough_chars`` релевантного текста, покрывающего
+    ``min_fields`` полей ``OrgInfo``, — новые загрузки не начинаются
+    (``enough_chars=0`` — обход до ``max_pages``).
+    """
+    started = time.perf_counter()
+    stats = stats if stats is not None else CrawlStats()
+    domain = urlparse(start_url).netloc
+    frontier = Frontier()
+    frontier.push(start_url)
+    coverage = relevance.Coverage(enough_chars, min_fields)
+
+    loop = asyncio.get_running_loop()
+    procs = extract.get_pool()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=extract.EXTRACT_QUEUE)
+    wake = asyncio.Event()
+
+    texts: Dict[int, str] = {}                 # порядковый номер → текст
+    done: Dict[int, Tuple[str, List[Tuple[str, str]], int]] = {}   # № → (текст, ссылки, глубина)
+    limits: Dict[str, asyncio.Semaphore] = {}
+    tasks: Set[asyncio.Task] = set()
+    dispatched = applied = 0
+
+    def finish(idx: int, txt: str = "", links: Optional[List[Tuple[str, str]]] = None,
+               depth: int = 0) -> None:
+        done[idx] = (txt, links or [], depth)
+        wake.set()
+
+    async def settle(upto: int) -> None:
+        """Учитывает страницы ``applied..upto-1`` по порядку номеров, дождавшись их."""
+        nonlocal applied
+        while applied < upto:
+            while applied not in done:
+                await wake.wait()
+                wake.clear()
+            txt, links, depth = done.pop(applied)
+            if len(txt) >= min_len:
+                texts[applied] = txt[:page_max_chars]
+                coverage.add(texts[applied])
+            for link, anchor in links:
+                if urlparse(link).netloc == domain and not download.skip_url(link):
+                    frontier.push(link, relevance.score_link(link, anchor, depth + 1), depth + 1)
+            applied += 1
+
+    async def fetcher(idx: int, url: str, depth: int) -> None:
+        t0 = time.perf_counter()
+        try:
+            page = await _fetch(client, url, limits, per_host_limit)
+        except Exception as exc:  # noqa: BLE001  (например, httpx.InvalidURL)
+            logging.warning("Failed to fetch %s: %s", url, exc)
+            page = None
+        if page is not None:
+            page.depth = depth
+        stats.fetch_seconds += time.perf_counter() - t0
+        if page is None or page.skipped:
+            if page is None:
+                stats.pages_failed += 1
+            else:
+                stats.pages_skipped += 1
+            finish(idx, depth=depth)
+        else:
+            page.queued = time.perf_counter()
+            await queue.put((idx, page))       # ждём, если разбор не успевает
+
+    async def extractor() -> None:
+        while True:
+            idx, page = await queue.get()
+            stats.queue_seconds += time.perf_counter() - page.queued
+            txt, links = "", []
+            try:
+                if page.cached:
+                    stats.pages_cached += 1
+                    txt, links = page.cached.text, page.cached.links
+                else:
+                    stats.pages_fetched += 1
+                    txt, links, secs = await asyncio.wait_for(
+                        loop.run_in_executor(procs, extract.parse_page, page.body, page.url,
+                                             download.header_charset(page.headers)),
+                        extract.EXTRACT_TIMEOUT,
+                    )
+                    stats.extract_seconds += secs
+                    metrics.observe("extract", secs)
+                    store = crawl_state.get_store()
+                    if store:
+                        store.put(crawl_state.CrawlState.from_response(
+                            page.url, page.headers, page.body, txt, links))
+            except Exception as exc:  # noqa: BLE001
+                logging.warning("Failed to extract %s: %s", page.url, exc)
+            finally:
+                finish(idx, txt, links, page.depth)
+
+    pool = httpx.Limits(
+        max_connections=per_host_limit * 2,
+        max_keepalive_connections=per_host_limit,
+    )
+    consumers = [asyncio.create_task(extractor()) for _ in range(extract.EXTRACT_WORKERS)]
+    try:
+        async with httpx.AsyncClient(
+            headers=headers, timeout=FETCH_TIMEOUT, limits=pool, follow_redirects=True,
+        ) as client:
+            # Страница №k запускается, когда учтены все страницы до k − window
+            # (и ни одной после): очередь и покрытие в этот момент одинаковы от
+            # прогона к прогону. В окне — загрузки (per_host_limit) и страницы,
+            # ждущие разбора, чтобы сеть не простаивала, пока идёт экстракция.
+            window = per_host_limit + extract.EXTRACT_QUEUE
+            while dispatched < max_pages:
+                await settle(dispatched - window + 1)
+                while not frontier and applied < dispatched:
+                    await settle(applied + 1)          # очередь пуста — ждём ссылок
+                if not frontier:
+                    break
+                if coverage.enough():
+                    stats.stopped_early = True
+                    break
+                task = asyncio.create_task(fetcher(dispatched, *frontier.pop()))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                dispatched += 1
+            await settle(dispatched)
+    finally:
+        for task in consumers:
+            task.cancel()
+        stats.pages_relevant = coverage.pages
+        stats.relevant_chars = coverage.chars
+        stats.wall_seconds = time.perf_counter() - started
+
+    return "\n".join(texts[i] for i in sorted(texts))
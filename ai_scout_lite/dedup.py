@@ -0,0 +1,93 @@
+"""Удаление повторяющихся абзацев перед LLM-экстракцией."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Set, Tuple
+
+from . import chunking
+
+SHINGLE = 4               # слов в шингле
+MIN_WORDS = 8             # короче — только точное совпадение
+MAX_DISTANCE = 3          # порог Хэмминга для «почти дубликата»
+_BANDS = 4
+_BAND_BITS = 64 // _BANDS
+_WORD = re.compile(r"\w+", re.U)
+
+
+@dataclass
+class DedupStats:
+    paragraphs:    int = 0
+    dropped:       int = 0
+    chars_in:      int = 0
+    chars_saved:   int = 0
+    tokens_saved:  int = 0
+
+
+def _hash64(s: str) -> int:
+    return int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(words: List[str], k: int = SHINGLE) -> int:
+    """64-битный SimHash по шинглам из ``k`` слов."""
+    weights = [0] * 64
+    for i in range(max(1, len(words) - k + 1)):
+        h = _hash64(" ".join(words[i:i + k]))
+        for bit in range(64):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+    return sum(1 << bit for bit, w in enumerate(weights) if w > 0)
+
+
+class Deduplicator:
+    """Пропускает абзацы, которых ещё не было (точно или почти)."""
+
+    def __init__(self, model: str = "gpt-4o-mini") -> None:
+        self.model = model
+        self.stats = DedupStats()
+        self._exact: Set[int] = set()
+        self._bands: Dict[Tuple[int, int], List[int]] = {}
+
+    def _near_duplicate(self, fp: int) -> bool:
+        for b in range(_BANDS):
+            band = (fp >> (b * _BAND_BITS)) & 0xFFFF
+            for other in self._bands.get((b, band), ()):
+                if bin(fp ^ other).count("1") <= MAX_DISTANCE:
+                    return True
+        return False
+
+    def _remember(self, fp: int) -> None:
+        for b in range(_BANDS):
+            band = (fp >> (b * _BAND_BITS)) & 0xFFFF
+            self._bands.setdefault((b, band), []).append(fp)
+
+    def seen(self, paragraph: str) -> bool:
+        """True, если абзац — повтор; иначе запоминает его."""
+        words = [w.lower() for w in _WORD.findall(paragraph)]
+        key = _hash64(" ".join(words))
+        if key in self._exact:
+            return True
+        self._exact.add(key)
+        if len(words) < MIN_WORDS:
+            return False
+
+        fp = simhash(words)
+        if self._near_duplicate(fp):
+            return True
+        self._remember(fp)
+        return False
+
+    def filter(self, text: str) -> str:
+        """Возвращает ``text`` без уже встречавшихся абзацев."""
+        kept: List[str] = []
+        for para in chunking.iter_paragraphs(text):
+            self.stats.paragraphs += 1
+            self.stats.chars_in += len(para)
+            if self.seen(para):
+                self.stats.dropped += 1
+                self.stats.chars_saved += len(para)
+                self.stats.tokens_saved += chunking.count_tokens(para, self.model)
+            else:
+                kept.append(para)
+        return "\n".join(kept)
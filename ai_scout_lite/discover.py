@@ -12,81 +12,48 @@ The module performs five operations:
 
 
 from __future__ import annotations
-import itertools
-import textwrap
-from collections import OrderedDict
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from rich import box, table
-from readability import Document
-from bs4 import BeautifulSoup as BS
-
-from urllib.parse import urljoin, urlparse
-import requests, trafilatura, time, random
-
-from selenium import webdriver
-from selenium.webdriver.firefox.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.firefox.service import Service
-from webdriver_manager.firefox import GeckoDriverManager
+import trafilatura, time
+import httpx
 
 from urllib.parse import quote_plus
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-from openai import OpenAI
 
-from fake_useragent import UserAgent
 import json
 import logging
 import os
-import urllib.parse
+import threading
 from dataclasses import dataclass, asdict, field
 from pathlib import Path
 
-import re, urllib.parse, tldextract, requests
+import re
 from transliterate import translit
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
-import requests_cache
-import trafilatura
-from .utils import extract_json
+from .utils import extract_json, bounded_map, FIREFOX_UA, HEADERS
+from . import (browser, chunking, crawl_state, crawler, dedup, download, extract, llm_budget,
+               llm_cache, metrics, ratelimit, relevance, results, search)
+from .scoring import OfficialScorer
+from .site_registry import get_registry
+from .manifest import OrgProgress
 from typing import Sequence
 
-# cache web requests to speed up repeated runs
-requests_cache.install_cache("ai_scout_cache")
+# Selenium и OpenAI SDK импортируются внутри функций, которым
+# они нужны: импорт модуля (а с ним каждый запуск main.py) их не грузит.
 
-import time
-import random
 from typing import List
-from duckduckgo_search import DDGS
-from duckduckgo_search.exceptions import DuckDuckGoSearchException
 from rich.console import Console
 
-if os.getenv("OPENAI_API_KEY"):
-    print("OPENAI_API_KEY настроена")
-else:
-    print("Переменная OPENAI_API_KEY не задана")
-
 console = Console()
 
-# Реальный Firefox UA (июнь-2025)
-FIREFOX_UA = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:126.0) "
-    "Gecko/20100101 Firefox/126.0"
-)
-HEADERS = {
-    "User-Agent": FIREFOX_UA,
-    "Accept":
-        "text/html,application/xhtml+xml,"
-        "application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-    "Accept-Language": "ru,en;q=0.9",
-    "DNT": "1",
-}
-
 OUTPUT_ROOT = Path("output")
 GOOD_TLDS = {"ru", "su", "org", "edu", "ac", "science", "tech"}
 _MAX_RETRIES = 3          # сколько раз пробуем прежде чем сдаться
 _BASE_SLEEP  = 2          # базовая задержка (сек)
+LLM_CHUNK_WORKERS = 4     # сколько кусков текста отправляем в LLM одновременно
+LLM_MAX_OUTPUT = 1_500    # потолок ответа extract_org_info — для оценки токенов
+SITE_SEARCH_WORKERS = 4   # параллельных поисковых запросов при поиске сайта
+SITE_HIGH_CONFIDENCE = 0.65   # с такой уверенностью остальные запросы отменяем
 
 
 @dataclass
@@ -133,67 +100,66 @@ ORG_INFO_SCHEMA = {
 
 
 def search_duckduckgo(query: str, max_results: int = 10) -> List[str]:
-    """DuckDuckGo search with Firefox UA, back-off and verbose logging."""
-    console.print(f"[cyan]→ DuckDuckGo query:[/] {query}")
+    """Web search with verbose logging.
 
-    for attempt in range(3):                    # ≤ 3 попытки
-        try:
-            with DDGS(headers=HEADERS, timeout=15) as ddgs:
-                hits = [
-                    r["href"] for r in ddgs.text(query, max_results=max_results)
-                    if r.get("href")
-                ]
-
-            if hits:
-                console.print(
-                    "[green]✔ результаты:[/]\n  " + "\n  ".join(hits[:2])
-                )
-            else:
-                console.print("[yellow]⚠ ничего не найдено[/]")
-
-            return hits
-
-        except DuckDuckGoSearchException as err:
-            wait = (2 ** attempt) + random.uniform(0, 1.2)
-            console.print(
-                f"[yellow]⚠ Rate-limit:[/] {err}. "
-                f"Повтор через {wait:0.1f} с."
-            )
-            time.sleep(wait)
+    Goes through the shared, cached search client (ai_scout_lite.search),
+    so the backend (DuckDuckGo by default, or a local corpus) is configurable.
+    """
+    console.print(f"[cyan]→ {search.get_client().backend.name} query:[/] {query}")
+    hits = search.search(query, max_results=max_results)
 
-    console.print("[red]❌ DuckDuckGo: все попытки исчерпаны[/]")
-    return []
+    if hits:
+        console.print(
+            "[green]✔ результаты:[/]\n  " + "\n  ".join(hits[:2])
+        )
+    else:
+        console.print("[yellow]⚠ ничего не найдено[/]")
+    return hits
 
-def ddg_first_links_firefox(query: str, n: int = 3) -> list[str]:
+def ddg_first_links_firefox(query: str, n: int = 3,
+                            stop: threading.Event | None = None) -> list[str]:
     """
     Возвращает первые n ссылок DuckDuckGo через headless-Firefox.
     • Не кликает форму; сразу открывает URL вида `/?q=...&ia=web`.
-    • Ждёт до 7 с появления результатов и берёт ссылки по CSS `.result__a`.
+    • Ждёт до 12 с появления результатов и берёт ссылки по CSS `.result__a`.
+    • Браузер берётся из общего пула (browser.get_pool()), а не стартует заново.
+    • `stop` выставлен — ответ больше не нужен: запрос не начинается, а
+      начатый возвращает [] на ближайшем опросе (≤ 0.25 с после загрузки
+      страницы), сразу отдавая браузер в пул.
     """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    stop = stop or threading.Event()
+    if stop.is_set():
+        return []
     console.print(f"[cyan]→ Firefox DDG query:[/] {query}")
+    ratelimit.wait("ddg-browser")
+    if stop.is_set():
+        return []
 
-    options = Options()
-    options.headless = True
-    driver = webdriver.Firefox(
-        service=Service(GeckoDriverManager().install()),
-        options=options,
-    )
-
-    try:
+    with metrics.span("browser"), browser.get_pool().lease() as driver:
         url = (
             "https://duckduckgo.com/?q="
             + quote_plus(query)
             + "&ia=web&kl=ru-ru"
         )
+        if stop.is_set():
+            return []
         driver.get(url)
 
+        results_shown = EC.presence_of_element_located((By.CSS_SELECTOR, "a.result__a"))
         try:
-            WebDriverWait(driver, 12).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "a.result__a"))
+            WebDriverWait(driver, 12, poll_frequency=0.25).until(
+                lambda d: stop.is_set() or results_shown(d)
             )
         except TimeoutException:
             console.print("[yellow]⚠ DDG: результаты не появились за 12 с[/]")
             return []
+        if stop.is_set():
+            return []
 
         links = driver.find_elements(By.CSS_SELECTOR, "a.result__a")[: n]
         hrefs = [link.get_attribute("href") for link in links]
@@ -207,17 +173,41 @@ def ddg_first_links_firefox(query: str, n: int = 3) -> list[str]:
 
         return hrefs
 
-    finally:
-        driver.quit()
+
+
+def _fetch_text_incremental(url: str, store: crawl_state.CrawlState) -> str:
+    """fetch_text с условным запросом; неизменившаяся страница — из store."""
+    state = store.get(url)
+    key = ratelimit.host_key(url)
+    ratelimit.wait(key)
+    # условный запрос (ETag / Last-Modified) — всегда к серверу
+    page = download.fetch(url, headers={**HEADERS, **store.conditional_headers(state)})
+    ratelimit.check_status(key, page.status, page.headers)
+    if state and (page.status == 304
+                  or (page.ok and state.content_hash == crawl_state.content_hash(page.body))):
+        return state.text
+    if not page.ok:
+        return ""
+    with metrics.span("extract"):
+        text = trafilatura.extract(page.body) or ""
+    store.put(store.from_response(url, page.headers, page.body, text, []))
+    return text
 
 
 def fetch_text(url: str) -> str:
     """Download and clean page text."""
 
+    store = crawl_state.get_store()
     try:
-        downloaded = trafilatura.fetch_url(url)
-        if downloaded:
-            return trafilatura.extract(downloaded) or ""
+        if store:
+            return _fetch_text_incremental(url, store)
+        key = ratelimit.host_key(url)
+        ratelimit.wait(key)
+        page = download.fetch(url, headers=HEADERS)
+        ratelimit.check_status(key, page.status, page.headers)
+        if page.ok and page.body:
+            with metrics.span("extract"):
+                return trafilatura.extract(page.body) or ""
     except Exception as exc:  # noqa: BLE001
         logging.warning("Failed to fetch %s: %s", url, exc)
     return ""
@@ -271,78 +261,109 @@ def _clean_name(name: str) -> str:
     #     or abbr.lower() in host              # РАН → ran, ИНХ → inh и т.п.
     #     or "ras." in host                    # большинство сайтов РАН
     # )
-SCIENCE_ZONES = (
-    "ras.ru", "ran.ru", "nsc.ru",        # Сибирское
-    "sbras.ru", "febras.ru", "ural.ru",  # отделения РАН
-    "iacp.dvo.ru", "ru/science",         # пример
-)
-
 def _looks_like_official(url: str, clean: str, abbr: str) -> bool:
-    host = urllib.parse.urlparse(url).netloc.lower()
-
-    # 0. Сразу отсеиваем Википедию / словари
-    if ".wikipedia.org" in host or host.endswith(".academic.ru"):
-        return False
-
-    # 1. Транслит первого значимого слова
-    first_word = translit(clean.split()[0], "ru", reversed=True).lower()
-
-    # 2. Подстроки из длинных слов (≥6)
-    stem_hits = False
-    for word in clean.split():
-        if len(word) >= 6:
-            stem = translit(word[:5], "ru", reversed=True).lower()
-            if stem in host:
-                stem_hits = True
-                break
-
-    # 3. Сдвигающееся окно 3-символов аббревиатуры
-    abbr_hits = any(abbr.lower()[i : i + 3] in host for i in range(len(abbr) - 2))
-
-    # 4. Научная «зона»
-    zone_hit = host.endswith(SCIENCE_ZONES)
-
-    return (
-        first_word in host
-        or abbr.lower() in host         # полное совпадение аббревиатуры
-        or abbr_hits                    # ≥3 подряд букв из аббревиатуры
-        or stem_hits                    # кусок длинного слова
-        or zone_hit                     # поддомен научного кластера
-    )
-
-def find_official_site(org: str) -> str:
-    """Возвращает URL официального сайта либо ''."""
-    console.rule("[bold green]🔍 Поиск официального сайта")
-    clean = _clean_name(org)
-    abbr  = "".join(w[0] for w in clean.split() if len(w) > 2)
+    """Совместимая обёртка над scoring.OfficialScorer (балл > 0).
 
+    Для пачки кандидатов стройте OfficialScorer один раз и берите баллы.
+    """
+    return OfficialScorer(clean, abbr).score(url) > 0
+
+def _search_official_site(clean: str, abbr: str) -> tuple[str, float, bool]:
+    """Поиск сайта: (URL, уверенность, ответил ли хоть один бэкенд).
+
+    URL '' при третьем элементе False — поиск не состоялся (все бэкенды
+    упали или вернули пустую выдачу: бан, сеть), а не «сайта нет».
+
+    Все фразы уходят одновременно в оба бэкенда (headless Firefox и
+    duckduckgo_search); ссылки оцениваются по мере прихода ответов. Если
+    поисковый клиент настроен не на DuckDuckGo (например, локальный
+    корпус), Firefox не используется — только настроенный бэкенд.
+    Уверенность = доверие к бэкенду × (0.5 + 0.5 · балл OfficialScorer).
+    Как только найден кандидат с уверенностью ≥ SITE_HIGH_CONFIDENCE,
+    оставшиеся запросы отменяются, а уже идущие поиски Firefox получают
+    `stop` и возвращают браузеры в пул, не дожидаясь выдачи DDG.
+    """
+    scorer = OfficialScorer(clean, abbr)
     queries = [
         f"{clean} официальный сайт",
         f"{clean} сайт организации",
         f"{translit(clean, 'ru', reversed=True)} official website",
         f"{abbr} сайт" if len(abbr) > 3 else "",
     ]
+    stop = threading.Event()
+    # бэкенд → (поиск, уверенность в «официальном» результате)
+    if search.get_client().backend.name == "ddg":
+        backends = {
+            "firefox": (lambda q: ddg_first_links_firefox(q, n=4, stop=stop), 0.9),
+            "ddgs":    (lambda q: search_duckduckgo(q, max_results=2), 0.7),
+        }
+    else:
+        backends = {"search": (lambda q: search_duckduckgo(q, max_results=4), 0.9)}
+
+    best_url, best_rank = "", (0.0, 0)             # (уверенность, −№ фразы)
+    answered = False
+    pool = ThreadPoolExecutor(max_workers=SITE_SEARCH_WORKERS)
+    futures = {
+        pool.submit(contextvars.copy_context().run, run, q): (qi, confidence)
+        for qi, q in enumerate(queries) if q
+        for run, confidence in backends.values()
+    }
+    try:
+        for fut in as_completed(futures):
+            qi, trust = futures[fut]
+            try:
+                urls = fut.result()
+            except Exception as exc:  # noqa: BLE001
+                logging.warning("Site search failed: %r", exc)
+                continue
+            answered = answered or bool(urls)
+            for url, score in scorer.rank(urls)[:1]:
+                rank = (round(trust * (0.5 + 0.5 * score), 3), -qi)
+                if rank > best_rank:
+                    best_url, best_rank = url, rank
+            if best_rank[0] >= SITE_HIGH_CONFIDENCE:
+                break                                 # дальше ждать незачем
+    finally:
+        stop.set()                                    # идущим поискам — вернуть браузер
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return best_url, best_rank[0], answered
 
-    for q in queries:
-        if not q:
-            continue
 
-        # ПРИОРИТЕТ — headless Firefox (без ratelimit)
-        for url in ddg_first_links_firefox(q, n=4):
-            if _looks_like_official(url, clean, abbr):
-                console.print(f"[green]✔ официальный сайт найден:[/] {url}")
-                return url
+def find_official_site(org: str) -> str:
+    """Возвращает URL официального сайта либо ''.
 
-        # fallback на duckduckgo_search (быстрее, но с риском 202)
-        for url in search_duckduckgo(q, max_results=2):
-            if _looks_like_official(url, clean, abbr):
-                console.print(f"[green]✔ официальный сайт найден:[/] {url}")
-                return url
+    Сначала смотрит в реестр (site_registry); поиск запускается, только
+    если записи нет или она устарела, и его результат попадает в реестр.
+    «Не найдено» запоминается, только если поиск вообще что-то вернул:
+    пустой ответ всех бэкендов (бан, сеть) в реестр не пишется.
+    """
+    console.rule("[bold green]🔍 Поиск официального сайта")
+    clean = _clean_name(org)
+    registry = get_registry()
+
+    entry = registry.lookup(clean)
+    if entry is not None:
+        console.print(f"[dim]↺ из реестра ({entry.source}, {entry.confidence:0.2f}):[/] "
+                      f"{entry.url or '— не найден'}")
+        return entry.url
+
+    abbr = "".join(w[0] for w in clean.split() if len(w) > 2)
+    url, confidence, answered = _search_official_site(clean, abbr)
+    if not answered:
+        console.print("[yellow]⚠ поиск сайта не дал ответа (бан или сеть) — не запоминаем")
+        return ""
+    registry.put(clean, url, confidence)
+    if url:
+        console.print(f"[green]✔ официальный сайт найден:[/] {url}")
+    else:
+        console.print("[yellow]⚠ официальный сайт не найден")
+    return url
 
-        time.sleep(1)  # честная пауза перед следующей фразой
 
-    console.print("[yellow]⚠ официальный сайт не найден")
-    return ""
+def pin_official_site(org: str, url: str, source: str = "manual") -> None:
+    """Закрепляет URL за организацией в реестре (поиск больше не нужен)."""
+    get_registry().pin(_clean_name(org), url, source=source)
 
 
 
@@ -372,54 +393,113 @@ def find_official_site(org: str) -> str:
     #
     # return _extract_info(text)
 
-def extract_official_info(org: str, out_dir: Path) -> OrgInfo:
+def extract_official_info(org: str, out_dir: Path,
+                          dedup_: dedup.Deduplicator | None = None,
+                          progress: OrgProgress | None = None) -> OrgInfo:
     """
     1) Находит официальный сайт.
     2) Краулит главную + ссылки 1-го уровня (crawl_one_level).
-    3) Сохраняет сырой текст в site_info.txt.
-    4) Прогоняет LLM-экстракцию и возвращает OrgInfo.
+    3) Убирает повторяющиеся абзацы (меню, подвалы) — dedup_.
+    4) Сохраняет текст в site_crawl.txt.
+    5) Прогоняет LLM-экстракцию, пишет site_info.json и возвращает OrgInfo.
+    Этапы, уже отмеченные в progress, не повторяются: берутся сохранённые
+    URL / site_crawl.txt / site_info.json.
     """
-    url = find_official_site(org)
-    if not url:
-        console.print("[yellow]⚠ Официальный сайт не найден")
-        return OrgInfo()                       # пустой dataclass
+    progress = progress or OrgProgress.detached()
+    dedup_ = dedup_ or dedup.Deduplicator()
+    crawl_path = out_dir / "site_crawl.txt"
+
+    if progress.done("site_extracted"):
+        console.print("[dim]↺ site_info.json уже есть — пропускаем сайт[/]")
+        return load_json(out_dir / "site_info.json")
+
+    if progress.done("crawled"):
+        text = crawl_path.read_text(encoding="utf-8") if crawl_path.exists() else ""
+        text = dedup_.filter(text)             # чтобы интернет-этап видел абзацы сайта
+    else:
+        if progress.done("site_found"):
+            url = progress.get("site_url", "")
+        else:
+            url = find_official_site(org)
+            if url or get_registry().lookup(_clean_name(org)) is not None:
+                progress.mark("site_found", site_url=url)   # без ответа поиска — повторим
 
-    console.print(f"[bold]🌐 Краулю сайт (1 уровень): {url}")
-    text = crawl_one_level(url)
+        text = ""
+        if not url:
+            console.print("[yellow]⚠ Официальный сайт не найден")
+        else:
+            console.print(f"[bold]🌐 Краулю сайт (1 уровень): {url}")
+            text = dedup_.filter(crawl_one_level(url))
+            if _unchanged(crawl_path, text, out_dir / "site_info.json"):
+                console.print("[dim]↺ текст сайта не изменился — оставляем прежний site_info.json[/]")
+                progress.mark("crawled")
+                progress.mark("site_extracted")
+                return load_json(out_dir / "site_info.json")
+            _write_text(crawl_path, text)
+            console.print(f"[green]📝 site_crawl.txt записан ({len(text)} симв.)")
+        progress.mark("crawled")
 
-    if not text:
+    if text:
+        info = _extract_info(text)             # использует chunk-режим
+    else:
         console.print("[yellow]⚠ Нет пригодного текста")
-        return OrgInfo()
+        info = OrgInfo()                       # пустой dataclass
 
-    (out_dir / "site_info.txt").write_text(text, encoding="utf-8")
-    console.print(f"[green]📝 site_info.txt записан ({len(text)} симв.)")
-
-    return _extract_info(text)                 # использует chunk-режим
+    save_json(info, out_dir / "site_info.json")
+    progress.mark("site_extracted")
+    return info
 # ---------------------------------------------------------------------------
 # internet search
 # ---------------------------------------------------------------------------
 
-def gather_internet_info(org: str, max_results: int = 10) -> OrgInfo:
-    """Search the web for public information about the organisation."""
+def _gather_internet_text(org: str, max_results: int,
+                          dedup_: dedup.Deduplicator) -> str:
     console.print("Читаем иные открытые источники")
-
     texts: List[str] = []
     query = f"{org} результаты партнеры исследования"
     for url in search_duckduckgo(query, max_results=max_results):
-        txt = fetch_text(url)
+        txt = dedup_.filter(fetch_text(url))
         if txt:
             texts.append(txt)
-    return _extract_info("\n".join(texts))
+    return "\n".join(texts)
+
+
+def gather_internet_info(org: str, max_results: int = 10,
+                         dedup_: dedup.Deduplicator | None = None) -> OrgInfo:
+    """Search the web for public information about the organisation.
+
+    Paragraphs already seen on the official site or in another source
+    are dropped by ``dedup_`` before the LLM call.
+    """
+    dedup_ = dedup_ or dedup.Deduplicator()
+    return _extract_info(_gather_internet_text(org, max_results, dedup_))
 
 
 # ---------------------------------------------------------------------------
 # saving helpers
 # ---------------------------------------------------------------------------
 
+def _write_text(path: Path, text: str) -> None:
+    with metrics.span("save") as sp:
+        data = text.encode("utf-8")
+        path.write_bytes(data)
+        sp.bytes = len(data)
+
+
 def save_json(info: OrgInfo, path: Path) -> None:
-    path.write_text(json.dumps(asdict(info), ensure_ascii=False, indent=2), encoding="utf-8")
+    _write_text(path, json.dumps(asdict(info), ensure_ascii=False, indent=2))
     console.print("сохранили файл")
 
+def _unchanged(text_path: Path, text: str, json_path: Path) -> bool:
+    """Инкрементальный режим: текст тот же, что в прошлый раз, и JSON уже есть."""
+    if crawl_state.get_store() is None or not json_path.exists() or not text_path.exists():
+        return False
+    return text_path.read_text(encoding="utf-8") == text
+
+def load_json(path: Path) -> OrgInfo:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return OrgInfo(**{k: data.get(k, []) for k in OrgInfo.__dataclass_fields__})
+
 def info_as_text(info: OrgInfo) -> str:
     lines = ["# Научные проблемы (science):"]
     lines += [f"- {s}" for s in info.science]
@@ -440,158 +520,232 @@ def info_as_text(info: OrgInfo) -> str:
 
 
 def save_txt(info: OrgInfo, path: Path) -> None:
-    path.write_text(info_as_text(info), encoding="utf-8")
+    _write_text(path, info_as_text(info))
 
 
 # ---------------------------------------------------------------------------
 # public API
 # ---------------------------------------------------------------------------
 
-def discover_org(org: str, output_dir: Path) -> None:
-    """Run discovery pipeline for the organisation."""
-    console.print("Запустили информационный скрининг организации")
-    output_dir.mkdir(parents=True, exist_ok=True)
+@dataclass
+class OrgSummary:
+    """Краткий итог обработки одной организации (для потокового отчёта)."""
 
-    site_info = extract_official_info(org, output_dir)
-    web_info = gather_internet_info(org)
+    org:        str
+    ok:         bool = True
+    seconds:    float = 0.0
+    site_items: int = 0          # сколько пунктов извлекли с сайта
+    web_items:  int = 0          # … и из открытых источников
+    saved_chars:  int = 0        # выкинуто дедупликацией
+    saved_tokens: int = 0
+    error:      str = ""
 
-    save_json(site_info, output_dir / "site_info.json")
-    save_json(web_info, output_dir / "internet_info.json")
 
-    save_txt(site_info, output_dir / "site_info.txt")
-    save_txt(web_info, output_dir / "internet_info.txt")
+def _count_items(info: OrgInfo) -> int:
+    return sum(len(v) for v in asdict(info).values())
+
+
+def discover_org(org: str, output_dir: Path,
+                 progress: OrgProgress | None = None) -> OrgSummary:
+    """Run discovery pipeline for the organisation.
+
+    ``progress`` (see :mod:`ai_scout_lite.manifest`) records finished
+    stages; stages already marked there are skipped and their stored
+    artifacts are reused.
+    """
+    console.print("Запустили информационный скрининг организации")
+    started = time.monotonic()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    progress = progress or OrgProgress.detached()
+
+    dedup_ = dedup.Deduplicator()               # общий для сайта и интернета
+    site_info = extract_official_info(org, output_dir, dedup_, progress)
+
+    web_path = output_dir / "internet_info.json"
+    if progress.done("web_extracted"):
+        web_info = load_json(web_path)
+    else:
+        crawl_path = output_dir / "site_crawl.txt"
+        if not dedup_.stats.paragraphs and crawl_path.exists():
+            dedup_.filter(crawl_path.read_text(encoding="utf-8"))
+        web_text = _gather_internet_text(org, 10, dedup_)
+        web_text_path = output_dir / "internet_crawl.txt"
+        if _unchanged(web_text_path, web_text, web_path):
+            console.print("[dim]↺ открытые источники не изменились — оставляем internet_info.json[/]")
+            web_info = load_json(web_path)
+        else:
+            _write_text(web_text_path, web_text)
+            web_info = _extract_info(web_text) if web_text else OrgInfo()
+            save_json(web_info, web_path)
+        progress.mark("web_extracted")
+    console.print(
+        f"[dim]дедупликация: −{dedup_.stats.dropped} абзацев, "
+        f"−{dedup_.stats.chars_saved:,} симв., ≈−{dedup_.stats.tokens_saved:,} токенов[/]"
+    )
+
+    store = results.get_store()
+    if store is not None:                       # отчёты — по запросу из общей базы
+        with metrics.span("save"):
+            store.put(org, "site", asdict(site_info), site_url=progress.get("site_url", ""))
+            store.put(org, "web", asdict(web_info))
+    else:
+        save_txt(site_info, output_dir / "site_info.txt")
+        save_txt(web_info, output_dir / "internet_info.txt")
+    progress.mark("saved")
+
+    return OrgSummary(
+        org=org,
+        seconds=time.monotonic() - started,
+        site_items=_count_items(site_info),
+        web_items=_count_items(web_info),
+        saved_chars=dedup_.stats.chars_saved,
+        saved_tokens=dedup_.stats.tokens_saved,
+    )
 
 def _diagnostic_download(url: str) -> str:
     """Скачивает URL, подробно логирует шаги, возвращает чистый текст ('' если нет)."""
     console.rule(f"[bold blue]🌐 Скачиваем {url}")
     headers = {"User-Agent": FIREFOX_UA}
 
-    # ── 1. HTTP GET ───────────────────────────────────────────────────
+    # ── 1-2. HTTP GET потоком, кодировка определяется по ходу ─────────
+    key = ratelimit.host_key(url)
     try:
-        r = requests.get(url, headers=headers, timeout=20)
-        console.print(f"Status: {r.status_code}, bytes: {len(r.content)}")
-        r.raise_for_status()
-    except requests.RequestException as err:
+        ratelimit.wait(key)
+        page = download.fetch(url, headers=headers, decode=True)
+    except (httpx.HTTPError, httpx.InvalidURL, httpx.StreamError) as err:   # последние два — не HTTPError
         console.print(f"[red]HTTP error:[/] {err}")
         return ""
+    if page.skipped:
+        console.print(f"[yellow]Пропущено ({page.skipped})[/]")
+        return ""
+    console.print(f"Status: {page.status}, chars: {len(page.text)}")
+    ratelimit.check_status(key, page.status, page.headers)
+    if not page.ok:
+        console.print(f"[red]HTTP error:[/] {page.status}")
+        return ""
+    console.print(f"Encoding: {page.encoding}")
 
-    # ── 2. Кодировка ─────────────────────────────────────────────────
-    enc_before = r.encoding or "None"
-    if not r.encoding or r.encoding.lower() == "iso-8859-1":
-        r.encoding = r.apparent_encoding
-    console.print(f"Encoding: {enc_before} → {r.encoding}")
-
-    html = r.text
+    html = page.text
 
-    # ── 3. Trafilatura ───────────────────────────────────────────────
+    # ── 3-4. Trafilatura → Readability fallback (в пуле процессов) ──────
     console.print("• Trafilatura.extract() …")
-    text = trafilatura.extract(
-        html,
-        include_images=False,
-        include_tables=False,
-        no_fallback=False,
-        target_language="ru",
-    )
-    if text:
-        console.print(f"[green]✔ Trafilatura OK:[/] {len(text)} chars")
-        return text
-
-    console.print("[yellow]Trafilatura вернула None – пробуем fallback Readability")
-
-    # ── 4. Readability fallback ──────────────────────────────────────
     try:
-        doc = Document(html)
-        text = BS(doc.summary(), "lxml").get_text(" ", strip=True)
-        console.print(f"[green]✔ Readability OK:[/] {len(text)} chars")
-        return text
-    except Exception as err:
-        console.print(f"[red]Readability failed:[/] {err}")
+        with metrics.span("extract"):
+            text, method = extract.run(extract.page_text, html)
+    except Exception as err:  # noqa: BLE001
+        console.print(f"[red]Extraction failed:[/] {err}")
         return ""
 
+    if method == "trafilatura":
+        console.print(f"[green]✔ Trafilatura OK:[/] {len(text)} chars")
+    elif method == "readability":
+        console.print("[yellow]Trafilatura вернула None – сработал fallback Readability")
+        console.print(f"[green]✔ Readability OK:[/] {len(text)} chars")
+    else:
+        console.print("[red]Readability failed[/]")
+    return text
+
 def crawl_one_level(
     start_url: str,
     max_pages: int = 10,
     min_len: int = 200,
     page_max_chars: int = 15_000,   # ← НОВОЕ: максимум символов с одной страницы
+    per_host_limit: int = crawler.PER_HOST_LIMIT,
+    enough_chars: int = relevance.ENOUGH_CHARS,
 ) -> str:
     """
-    Скачивает главную + все ссылки 1-го уровня и возвращает объединённый текст.
+    Скачивает главную + ссылки сайта и возвращает объединённый текст.
+    • Ссылки берутся по убыванию релевантности (анкор, путь, глубина —
+      см. ai_scout_lite.relevance), а не в порядке на странице.
+    • Набрали enough_chars релевантного текста — дальше не качаем
+      (0 — до max_pages).
     • Если очищенный текст < min_len — пропускаем страницу.
     • Если очищенный текст > page_max_chars — обрезаем его до page_max_chars.
+    • Страницы качаются параллельно (не более per_host_limit на хост),
+      а разбираются в пуле процессов — см. ai_scout_lite.crawler.
     """
-    domain = urlparse(start_url).netloc
-    visited: set[str] = set()
-    queue:   list[str] = [start_url]
-    texts:   list[str] = []
-
-    while queue and len(visited) < max_pages:
-        url = queue.pop(0)
-        if url in visited:
-            continue
-        visited.add(url)
-
-        try:
-            r = requests.get(url, headers=HEADERS, timeout=15)
-            r.raise_for_status()
-        except requests.RequestException:
-            continue
-
-        html = r.text
-        txt = trafilatura.extract(html, target_language="ru", no_fallback=False) or ""
-        if len(txt) >= min_len:
-            # ── ограничиваем размер одной страницы ──────────────────
-            if len(txt) > page_max_chars:
-                txt = txt[:page_max_chars]
-            texts.append(txt)
-
-        # собираем ссылки глубины 1
-        soup = BS(html, "lxml")
-        for a in soup.find_all("a", href=True):
-            link = urljoin(url, a["href"])
-            if urlparse(link).netloc == domain and link not in visited:
-                queue.append(link)
-
-        time.sleep(0.5 + random.uniform(0, 0.5))
-
-    return "\n".join(texts)
+    stats = crawler.CrawlStats()
+    text = asyncio.run(crawler.crawl(
+        start_url,
+        max_pages=max_pages,
+        min_len=min_len,
+        page_max_chars=page_max_chars,
+        per_host_limit=per_host_limit,
+        headers=HEADERS,
+        stats=stats,
+        enough_chars=enough_chars,
+    ))
+    console.print(
+        f"[dim]краулинг: {stats.pages_fetched} стр. (+{stats.pages_cached} без изменений, "
+        f"{stats.pages_failed} ошибок, {stats.pages_skipped} не HTML/слишком больших) за {stats.wall_seconds:0.1f} с; "
+        f"загрузка {stats.fetch_seconds:0.1f} с, очередь {stats.queue_seconds:0.1f} с, "
+        f"разбор {stats.extract_seconds:0.1f} с; релевантных {stats.pages_relevant} стр., "
+        f"{stats.relevant_chars:,} симв.{' — достаточно, остановились' if stats.stopped_early else ''}[/]"
+    )
+    return text
 
 def _extract_info(text: str,
                   model: str = "gpt-4o-mini",
-                  chunk: int = 30_000) -> OrgInfo:
+                  chunk_tokens: int = chunking.CHUNK_TOKENS,
+                  overlap_tokens: int = 0,
+                  max_parallel: int = LLM_CHUNK_WORKERS) -> OrgInfo:
     """
-    • Если текст ≤ chunk — единичный вызов function-calling.
-    • Если больше — режем на куски и агрегируем ответы.
+    • Если текст влезает в бюджет chunk_tokens — единичный вызов function-calling.
+    • Если больше — режем по абзацам/предложениям (chunking.iter_chunks),
+      отправляем куски параллельно (не более max_parallel запросов)
+      и агрегируем ответы по порядку.
     """
     def call_llm(piece: str) -> dict:
         user_msg = PROMPT_INFO.format(text=piece)
-        resp = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system",
-                 "content": "Ты эксперт по научной аналитике. "
-                            "Проанализируй текст и вызови функцию extract_org_info."},
-                {"role": "user", "content": user_msg}
-            ],
-            functions=[ORG_INFO_SCHEMA],
-            function_call={"name": "extract_org_info"},
-        )
-        return json.loads(resp.choices[0].message.function_call.arguments)
+        messages = [
+            {"role": "system",
+             "content": "Ты эксперт по научной аналитике. "
+                        "Проанализируй текст и вызови функцию extract_org_info."},
+            {"role": "user", "content": user_msg}
+        ]
+
+        def complete() -> str:
+            tokens_in = chunking.count_tokens(
+                "\n".join(m["content"] for m in messages) + json.dumps(ORG_INFO_SCHEMA), model)
+            with llm_budget.admit(model, tokens_in, LLM_MAX_OUTPUT) as ticket, \
+                    metrics.span("llm") as sp:
+                resp = client.chat.completions.create(
+                    model=ticket.model,
+                    messages=messages,
+                    functions=[ORG_INFO_SCHEMA],
+                    function_call={"name": "extract_org_info"},
+                )
+                if resp.usage:
+                    sp.tokens_in = resp.usage.prompt_tokens
+                    sp.tokens_out = resp.usage.completion_tokens
+                    ticket.settle(sp.tokens_in, sp.tokens_out)
+            return resp.choices[0].message.function_call.arguments
+
+        key = llm_cache.make_key(model, messages, ORG_INFO_SCHEMA)
+        return json.loads(llm_cache.get_cache().cached(key, complete))
+
+    from openai import OpenAI
 
     client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
     # ── короткие тексты ─────────────────────────────────────────────
-    if len(text) <= chunk:
+    budget = chunking.token_budget(model, chunk_tokens)
+    if len(text) <= budget or chunking.count_tokens(text, model) <= budget:
         data = call_llm(text)
         return OrgInfo(**{k: data.get(k, []) for k in OrgInfo.__dataclass_fields__})
 
     # ── длинные тексты  → chunk-map-reduce ─────────────────────────
-    console.print(f"[cyan]🔧 Text = {len(text):,} chars → chunking")
-    parts = textwrap.wrap(text, chunk)
+    console.print(f"[cyan]🔧 Text = {len(text):,} chars → chunking по {budget:,} токенов")
+    parts = chunking.iter_chunks(text, model, chunk_tokens, overlap_tokens)
     agg = {k: [] for k in OrgInfo.__dataclass_fields__}
 
-    for i, part in enumerate(parts, 1):
-        console.print(f"⮑  Chunk {i}/{len(parts)} ({len(part)} chars)")
-        data = call_llm(part)
+    def call_part(numbered: tuple[int, str]) -> dict:
+        i, part = numbered
+        console.print(f"⮑  Chunk {i} ({len(part)} chars)")
+        return call_llm(part)
+
+    # map: куски режутся лениво и уходят параллельно, ответы — в исходном порядке
+    for data in bounded_map(call_part, enumerate(parts, 1), max_parallel):
         for k in agg:
             agg[k].extend(data.get(k, []))
 
@@ -0,0 +1,199 @@
+"""Потоковая загрузка страниц с ранним отсевом."""
+
+from __future__ import annotations
+
+import codecs
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+from charset_normalizer import from_bytes
+
+from . import metrics
+
+MAX_BYTES = int(os.getenv("AI_SCOUT_MAX_PAGE_BYTES", str(3 * 2**20)))
+TIMEOUT = 20
+HTML_TYPES = ("text/html", "application/xhtml+xml")
+SKIP_EXTENSIONS = frozenset(
+    ".pdf .doc .docx .xls .xlsx .ppt .pptx .odt .ods .rtf .djvu .epub "
+    ".zip .rar .7z .gz .tgz .bz2 .tar .exe .msi .dmg .iso .apk "
+    ".jpg .jpeg .png .gif .bmp .tif .tiff .svg .webp .ico "
+    ".mp3 .wav .ogg .flac .mp4 .avi .mov .mkv .wmv .webm .flv "
+    ".css .js .json .xml .rss .woff .woff2 .ttf .eot".split()
+)
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.I)
+_SNIFF_BYTES = 4096
+
+
+@dataclass
+class Page:
+    url:     str                         # итоговый URL (после редиректов)
+    status:  int = 0
+    headers: httpx.Headers = field(default_factory=httpx.Headers)
+    body:    bytes = b""                 # сырое тело (decode=False)
+    text:    str = ""                    # декодированное тело (decode=True)
+    encoding: str = ""
+    skipped: str = ""                    # extension / content-type / too-large
+
+    @property
+    def ok(self) -> bool:
+        return not self.skipped and 200 <= self.status < 300
+
+
+def skip_url(url: str) -> bool:
+    """Ссылка на файл, а не страницу — не качаем."""
+    path = urlparse(url).path.lower()
+    return os.path.splitext(path)[1] in SKIP_EXTENSIONS
+
+
+def _reject_by_headers(headers: httpx.Headers, max_bytes: int) -> str:
+    ctype = headers.get("Content-Type", "").split(";")[0].strip().lower()
+    if ctype and ctype not in HTML_TYPES:
+        return "content-type"
+    length = headers.get("Content-Length", "")
+    if length.isdigit() and int(length) > max_bytes:
+        return "too-large"
+    return ""
+
+
+def header_charset(headers: httpx.Headers) -> str:
+    """``charset`` из ``Content-Type`` ('' — не указан)."""
+    return headers.get("Content-Type", "").partition("charset=")[2].split(";")[0].strip(" \"'")
+
+
+def _charset(headers: httpx.Headers, head: bytes) -> str:
+    """Кодировка: заголовок → ``<meta charset>`` → угадывание по первым байтам."""
+    for candidate in (
+        header_charset(headers),
+        (m.group(1).decode("ascii", "ignore") if (m := _META_CHARSET.search(head)) else ""),
+    ):
+        if candidate:
+            try:
+                return codecs.lookup(candidate).name
+            except LookupError:
+                pass
+    best = from_bytes(head).best()
+    return best.encoding if best else "utf-8"
+
+
+class _Reader:
+    """Накопитель тела: байты или инкрементально декодированный текст."""
+
+    def __init__(self, page: Page, max_bytes: int, decode: bool) -> None:
+        self.page, self.max_bytes, self.decode = page, max_bytes, decode
+        self.size = 0
+        self._chunks: List[bytes] = []
+        self._text: List[str] = []
+        self._decoder: Optional[codecs.IncrementalDecoder] = None
+        self._head = b""
+
+    def feed(self, chunk: bytes) -> bool:
+        """``False`` — превышен лимит, загрузку надо оборвать."""
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            self.page.skipped = "too-large"
+            return False
+        if not self.decode:
+            self._chunks.append(chunk)
+        elif self._decoder is None:               # копим начало, чтобы определить кодировку
+            self._head += chunk
+            if len(self._head) >= _SNIFF_BYTES:
+                self._start_decoding()
+        else:
+            self._text.append(self._decoder.decode(chunk))
+        return True
+
+    def _start_decoding(self) -> None:
+        self.page.encoding = _charset(self.page.headers, self._head)
+        self._decoder = codecs.getincrementaldecoder(self.page.encoding)(errors="replace")
+        self._text.append(self._decoder.decode(self._head))
+        self._head = b""
+
+    def finish(self) -> Page:
+        if self.page.skipped:
+            return self.page
+        if self.decode:
+            if self._decoder is None:
+                self._start_decoding()
+            self._text.append(self._decoder.decode(b"", final=True))
+            self.page.text = "".join(self._text)
+        else:
+            self.page.body = b"".join(self._chunks)
+        return self.page
+
+
+def _note_skip(reason: str) -> None:
+    metrics.add(f"fetch_skipped_{reason.replace('-', '_')}")
+
+
+def _skipped(url: str, reason: str) -> Page:
+    _note_skip(reason)
+    return Page(url, skipped=reason)
+
+
+def _start(response: httpx.Response, max_bytes: int,
+           decode: bool) -> Tuple[Page, Optional[_Reader]]:
+    page = Page(str(response.url), response.status_code, response.headers)
+    if not 200 <= response.status_code < 300:
+        return page, None                        # 304 / 4xx / 5xx — тело не нужно
+    reason = _reject_by_headers(response.headers, max_bytes)
+    if reason:
+        _note_skip(reason)
+        page.skipped = reason
+        return page, None
+    return page, _Reader(page, max_bytes, decode)
+
+
+def fetch(url: str, headers: Optional[Dict[str, str]] = None, max_bytes: int = MAX_BYTES,
+          decode: bool = False, client: Optional[httpx.Client] = None) -> Page:
+    """Синхронная потоковая загрузка (общий keep-alive клиент)."""
+    if skip_url(url):
+        return _skipped(url, "extension")
+    with metrics.span("fetch") as sp:
+        with (client or get_client()).stream("GET", url, headers=headers) as response:
+            page, reader = _start(response, max_bytes, decode)
+            if reader is None:
+                return page
+            for chunk in response.iter_bytes():
+                if not reader.feed(chunk):
+                    _note_skip("too-large")
+                    break
+            sp.bytes = reader.size
+    return reader.finish()
+
+
+async def fetch_async(client: httpx.AsyncClient, url: str,
+                      headers: Optional[Dict[str, str]] = None,
+                      max_bytes: int = MAX_BYTES, decode: bool = False) -> Page:
+    """То же для ``httpx.AsyncClient`` (краулер)."""
+    if skip_url(url):
+        return _skipped(url, "extension")
+    with metrics.span("fetch") as sp:
+        async with client.stream("GET", url, headers=headers) as response:
+            page, reader = _start(response, max_bytes, decode)
+            if reader is None:
+                return page
+            async for chunk in response.aiter_bytes():
+                if not reader.feed(chunk):
+                    _note_skip("too-large")
+                    break
+            sp.bytes = reader.size
+    return reader.finish()
+
+
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> httpx.Client:
+    """Общий на процесс синхронный клиент (пул соединений)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(timeout=TIMEOUT, follow_redirects=True)
+        return _client
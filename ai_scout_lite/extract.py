@@ -0,0 +1,95 @@
+"""CPU-этап: HTML → чистый текст и ссылки, в пуле процессов."""
+
+from __future__ import annotations
+
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Tuple, TypeVar
+from urllib.parse import urljoin
+
+import lxml.html
+import trafilatura
+from lxml.etree import ParserError
+from readability import Document
+
+EXTRACT_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+EXTRACT_QUEUE = EXTRACT_WORKERS * 2      # сырых страниц в очереди, дальше — backpressure
+EXTRACT_TIMEOUT = 60                     # сек на одну страницу
+
+T = TypeVar("T")
+
+
+ANCHOR_CHARS = 200                       # длиннее — это уже не подпись ссылки
+
+
+def parse_page(html: bytes, url: str,
+               encoding: str = "") -> Tuple[str, List[Tuple[str, str]], float]:
+    """Текст страницы, ссылки ``(абсолютный URL, текст анкора)`` и время разбора (сек).
+
+    ``encoding`` — charset из заголовка ответа; без него lxml смотрит только
+    ``<meta charset>`` и кириллицу без meta читал как latin-1.
+    """
+    started = time.perf_counter()
+    try:
+        parser = lxml.html.HTMLParser(encoding=encoding) if encoding else None
+        tree = lxml.html.document_fromstring(html, parser=parser)
+    except (ParserError, ValueError, LookupError):
+        return "", [], time.perf_counter() - started
+
+    links = [
+        (urljoin(url, a.get("href").strip()),
+         " ".join((a.text_content() or a.get("title") or "").split())[:ANCHOR_CHARS])
+        for a in tree.xpath("//a[@href]")
+    ]
+    txt = trafilatura.extract(tree, target_language="ru", no_fallback=False) or ""
+    return txt, links, time.perf_counter() - started
+
+
+def page_text(html: str) -> Tuple[str, str]:
+    """Текст страницы и чем он получен: ``trafilatura`` / ``readability`` / ``''``."""
+    text = trafilatura.extract(
+        html,
+        include_images=False,
+        include_tables=False,
+        no_fallback=False,
+        target_language="ru",
+    )
+    if text:
+        return text, "trafilatura"
+
+    try:
+        summary = lxml.html.fromstring(Document(html).summary())
+        return " ".join(summary.text_content().split()), "readability"
+    except Exception:  # noqa: BLE001
+        return "", ""
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _mp_context() -> multiprocessing.context.BaseContext:
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload([__name__])   # lxml/trafilatura грузятся один раз
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Общий на процесс пул экстракции."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS, mp_context=_mp_context())
+            atexit.register(_pool.shutdown, cancel_futures=True)
+        return _pool
+
+
+def run(fn: Callable[..., T], *args) -> T:
+    """Синхронно выполняет ``fn(*args)`` в пуле экстракции."""
+    return get_pool().submit(fn, *args).result(timeout=EXTRACT_TIMEOUT)
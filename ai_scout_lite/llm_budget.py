@@ -0,0 +1,280 @@
+"""Планировщик вызовов LLM: лимиты TPM/RPM и бюджет организации."""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+
+from . import metrics
+
+WINDOW = 60.0                # сек — TPM/RPM считаются за минуту
+DOWNGRADE_AFTER = 5.0        # сек очереди, после которых берём модель попроще
+ORG_BUDGET_USD = float(os.getenv("AI_SCOUT_ORG_BUDGET_USD", "0") or 0)
+
+# модель → (TPM, RPM); «*» — для остальных
+DEFAULT_LIMITS: Dict[str, Tuple[int, int]] = {
+    "gpt-4o-mini":            (200_000, 500),
+    "gpt-4o":                 (30_000, 500),
+    "gpt-4.1-mini":           (200_000, 500),
+    "gpt-4.1":                (30_000, 500),
+    "gpt-3.5-turbo-instruct": (90_000, 3_500),
+    "*":                      (60_000, 500),
+}
+# $ за 1M токенов (вход, выход)
+PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini":            (0.15, 0.60),
+    "gpt-4o":                 (2.50, 10.00),
+    "gpt-4.1-mini":           (0.40, 1.60),
+    "gpt-4.1":                (2.00, 8.00),
+    "gpt-4-turbo":            (10.00, 30.00),
+    "gpt-3.5-turbo":          (0.50, 1.50),
+    "gpt-3.5-turbo-instruct": (1.50, 2.00),
+}
+DEFAULT_PRICE = (2.50, 10.00)
+DOWNGRADE = {
+    "gpt-4o": "gpt-4o-mini",
+    "gpt-4-turbo": "gpt-4o-mini",
+    "gpt-4.1": "gpt-4.1-mini",
+}
+
+
+class BudgetExceeded(RuntimeError):
+    """Бюджет организации на LLM исчерпан."""
+
+
+def cost(model: str, tokens_in: int, tokens_out: int) -> float:
+    price_in, price_out = PRICES.get(model, DEFAULT_PRICE)
+    return (tokens_in * price_in + tokens_out * price_out) / 1e6
+
+
+@dataclass
+class ModelUsage:
+    requests:       int = 0
+    tokens_in:      int = 0
+    tokens_out:     int = 0
+    estimated:      int = 0        # оценка до вызова (вход + потолок ответа)
+    cost:           float = 0.0
+    queued:         int = 0        # вызовов, ждавших окна
+    queued_seconds: float = 0.0
+    downgrades:     int = 0        # вызовов, пересаженных на эту модель
+    failed:         int = 0        # упали с исключением — резерв снят, не оплачены
+
+
+class _Window:
+    """Скользящее минутное окно одной модели."""
+
+    def __init__(self, tpm: int, rpm: int) -> None:
+        self.tpm, self.rpm = tpm, rpm
+        self.used = 0
+        self._events: Deque[List] = deque()      # [время, токены, в окне?]
+
+    def _trim(self, now: float) -> None:
+        while self._events and now - self._events[0][0] >= WINDOW:
+            event = self._events.popleft()
+            self.used -= event[1]
+            event[2] = False
+
+    def delay(self, tokens: int, now: float) -> float:
+        """Через сколько сек в окне найдётся место для ``tokens``."""
+        self._trim(now)
+        fits = lambda used, n: (n < self.rpm and used + tokens <= self.tpm) or n == 0  # noqa: E731
+        used, n = self.used, len(self._events)
+        if fits(used, n):
+            return 0.0
+        for t, spent, _ in self._events:               # освобождаем от старых к новым
+            used, n = used - spent, n - 1
+            if fits(used, n):
+                return t + WINDOW - now
+        return WINDOW
+
+    def take(self, tokens: int, now: float) -> List:
+        event = [now, tokens, True]
+        self._events.append(event)
+        self.used += tokens
+        return event
+
+    def adjust(self, event: List, tokens: int) -> None:
+        if event[2]:
+            self.used += tokens - event[1]
+        event[1] = tokens
+
+    def release(self, event: List) -> None:
+        """Убирает резерв вызова, который не состоялся."""
+        if event[2]:
+            self._events.remove(event)
+            self.used -= event[1]
+            event[2] = False
+
+
+class Ticket:
+    """Допуск одного вызова; :meth:`settle` — фактический расход, :meth:`release` — отказ."""
+
+    def __init__(self, scheduler: "Scheduler", model: str, org: str,
+                 tokens_in: int, max_out: int, event: List, reserved: float) -> None:
+        self.model = model                 # модель, которую надо вызвать
+        self.org = org
+        self.tokens_in = tokens_in
+        self.max_out = max_out
+        self._scheduler = scheduler
+        self._event = event
+        self._reserved = reserved
+        self._settled = False
+
+    def settle(self, tokens_in: Optional[int], tokens_out: Optional[int]) -> None:
+        """Фактические токены из ответа (``None`` — оставить оценку)."""
+        if self._settled:
+            return
+        self._settled = True
+        self._scheduler._settle(self, self.tokens_in if tokens_in is None else tokens_in,
+                                self.max_out if tokens_out is None else tokens_out)
+
+    def release(self) -> None:
+        """Вызов не удался: резерв возвращается в окно и бюджет, расход не считается."""
+        if self._settled:
+            return
+        self._settled = True
+        self._scheduler._release(self)
+
+    def __enter__(self) -> "Ticket":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.release()
+        else:
+            self.settle(None, None)        # ответ без usage — считаем по оценке
+
+
+class Scheduler:
+    """Допуск вызовов LLM по окнам моделей и бюджетам организаций."""
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[int, int]]] = None,
+                 org_budget: float = ORG_BUDGET_USD) -> None:
+        self.limits = dict(limits or DEFAULT_LIMITS)
+        self.org_budget = org_budget
+        self.usage: Dict[str, ModelUsage] = {}
+        self.spent: Dict[str, float] = {}
+        self._windows: Dict[str, _Window] = {}
+        self._cond = threading.Condition()
+
+    def _window(self, model: str) -> _Window:
+        if model not in self._windows:
+            self._windows[model] = _Window(*self.limits.get(model, self.limits["*"]))
+        return self._windows[model]
+
+    def _usage(self, model: str) -> ModelUsage:
+        return self.usage.setdefault(model, ModelUsage())
+
+    def _fit_budget(self, model: str, org: str, tokens_in: int, max_out: int) -> str:
+        if not org or not self.org_budget:
+            return model
+        remaining = self.org_budget - self.spent.get(org, 0.0)
+        for candidate in (model, DOWNGRADE.get(model)):
+            if candidate and cost(candidate, tokens_in, max_out) <= remaining:
+                return candidate
+        raise BudgetExceeded(f"{org}: LLM budget ${self.org_budget:g} exhausted "
+                             f"(spent ${self.spent.get(org, 0.0):.4f})")
+
+    def admit(self, model: str, tokens_in: int, max_out: int) -> Ticket:
+        """Ждёт места в окне (или понижает модель) и резервирует токены."""
+        current = metrics.current()
+        org = current.org if current else ""
+        estimate = tokens_in + max_out
+        started = time.monotonic()
+        with self._cond:
+            chosen = model
+            while True:
+                # бюджет — на каждом круге: пока ждали окна, его могли потратить другие
+                chosen = self._fit_budget(chosen, org, tokens_in, max_out)
+                now = time.monotonic()
+                delay = self._window(chosen).delay(estimate, now)
+                if delay <= 0:
+                    break
+                alt = DOWNGRADE.get(chosen)
+                if (alt and now - started + delay > DOWNGRADE_AFTER
+                        and self._window(alt).delay(estimate, now) <= 0):
+                    chosen = alt
+                    continue                           # проверить бюджет на alt
+                self._cond.wait(delay)
+            event = self._window(chosen).take(estimate, now)
+            reserved = cost(chosen, tokens_in, max_out)
+            if org:
+                self.spent[org] = self.spent.get(org, 0.0) + reserved
+
+            waited = time.monotonic() - started
+            usage = self._usage(chosen)
+            usage.estimated += estimate
+            if waited > 0.01:
+                usage.queued += 1
+                usage.queued_seconds += waited
+            if chosen != model:
+                usage.downgrades += 1
+
+        if waited > 0.01:
+            metrics.add("llm_queue_wait")
+            metrics.add("llm_queue_seconds", waited)
+        if chosen != model:
+            metrics.add("llm_downgrade")
+            logging.info("LLM %s → %s (limits/budget)", model, chosen)
+        return Ticket(self, chosen, org, tokens_in, max_out, event, reserved)
+
+    def _settle(self, ticket: Ticket, tokens_in: int, tokens_out: int) -> None:
+        actual = cost(ticket.model, tokens_in, tokens_out)
+        with self._cond:
+            self._window(ticket.model).adjust(ticket._event, tokens_in + tokens_out)
+            if ticket.org:
+                self.spent[ticket.org] += actual - ticket._reserved
+            usage = self._usage(ticket.model)
+            usage.requests += 1
+            usage.tokens_in += tokens_in
+            usage.tokens_out += tokens_out
+            usage.cost += actual
+            self._cond.notify_all()            # оценка могла оказаться завышенной
+        metrics.add("llm_cost_usd", actual)
+
+    def _release(self, ticket: Ticket) -> None:
+        with self._cond:
+            self._window(ticket.model).release(ticket._event)
+            if ticket.org:
+                self.spent[ticket.org] -= ticket._reserved
+            usage = self._usage(ticket.model)
+            usage.estimated -= ticket.tokens_in + ticket.max_out
+            usage.failed += 1
+            self._cond.notify_all()
+        metrics.add("llm_failed")
+
+    def report(self) -> Dict[str, ModelUsage]:
+        with self._cond:
+            return {m: ModelUsage(**vars(u)) for m, u in self.usage.items()}
+
+
+def _load_env(limits: Dict[str, Tuple[int, int]]) -> Dict[str, Tuple[int, int]]:
+    for item in os.getenv("AI_SCOUT_LLM_LIMITS", "").split(","):
+        if "=" not in item:
+            continue
+        model, spec = item.split("=", 1)
+        tpm, _, rpm = spec.partition(":")
+        limits[model.strip()] = (int(float(tpm)), int(float(rpm or limits["*"][1])))
+    return limits
+
+
+_scheduler: Optional[Scheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> Scheduler:
+    """Общий на процесс планировщик."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler(_load_env(dict(DEFAULT_LIMITS)))
+        return _scheduler
+
+
+def admit(model: str, tokens_in: int, max_out: int) -> Ticket:
+    return get_scheduler().admit(model, tokens_in, max_out)
@@ -0,0 +1,179 @@
+"""Дисковый кэш ответов LLM."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from . import chunking, llm_budget, metrics
+
+CACHE_PATH = os.getenv("AI_SCOUT_LLM_CACHE", "ai_scout_llm_cache.sqlite")
+TTL = 30 * 24 * 3600          # сек; ответы старше месяца перезапрашиваем
+MAX_BYTES = 200 * 1024 ** 2   # суммарный размер ответов
+
+
+@dataclass
+class CacheStats:
+    hits:   int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def make_key(
+    model: str,
+    messages: Sequence[Dict[str, Any]],
+    schema: Optional[Dict[str, Any]] = None,
+    **params: Any,
+) -> str:
+    """Стабильный ключ запроса к LLM."""
+    payload = {"model": model, "messages": list(messages), "schema": schema, "params": params}
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """SQLite-кэш строковых ответов LLM (потокобезопасный)."""
+
+    def __init__(self, path: str = CACHE_PATH, ttl: float = TTL, max_bytes: int = MAX_BYTES) -> None:
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " created REAL NOT NULL, accessed REAL NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS llm_accessed_idx ON llm_responses(accessed)")
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, created FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self.stats.misses += 1
+                return None
+            self._db.execute("UPDATE llm_responses SET accessed = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.stats.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?, ?)",
+                (key, value, now, now, len(value.encode("utf-8"))),
+            )
+            self._evict(now)
+            self._db.commit()
+
+    def _evict(self, now: float) -> None:
+        self._db.execute("DELETE FROM llm_responses WHERE created < ?", (now - self.ttl,))
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # вытесняем самые давно читанные, пока не уйдём в 90 % лимита
+        excess = total - int(self.max_bytes * 0.9)
+        for key, size in self._db.execute(
+            "SELECT key, size FROM llm_responses ORDER BY accessed"
+        ).fetchall():
+            if excess <= 0:
+                break
+            self._db.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+            excess -= size
+
+    def cached(self, key: str, compute: Callable[[], str]) -> str:
+        """Ответ из кэша или ``compute()`` с записью результата."""
+        value = self.get(key)
+        if value is None:
+            metrics.add("llm_cache_miss")
+            value = compute()
+            self.set(key, value)
+        else:
+            metrics.add("llm_cache_hit")
+        return value
+
+
+class _NullCache(LLMCache):
+    """Заглушка для ``AI_SCOUT_LLM_CACHE=off``: всё — промахи."""
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Optional[str]:
+        self.stats.misses += 1
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        pass
+
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> LLMCache:
+    """Общий на процесс кэш."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = _NullCache() if CACHE_PATH.lower() == "off" else LLMCache()
+        return _cache
+
+
+def _invoke(llm: Any, text: str) -> Tuple[str, Optional[int], Optional[int]]:
+    """Ответ LangChain-модели и usage (вход, выход), если модель его отдала."""
+    from langchain_core.language_models import BaseLLM
+
+    if isinstance(llm, BaseLLM):                  # completion-модели: usage в llm_output
+        result = llm.generate([text])
+        usage = (result.llm_output or {}).get("token_usage", {})
+        return (result.generations[0][0].text,
+                usage.get("prompt_tokens"), usage.get("completion_tokens"))
+    message = llm.invoke(text)
+    usage = getattr(message, "usage_metadata", None) or {}
+    return (getattr(message, "content", message),
+            usage.get("input_tokens"), usage.get("output_tokens"))
+
+
+def cached_invoke(prompt: Any, llm: Any, variables: Dict[str, Any]) -> str:
+    """``(prompt | llm).invoke(variables)`` для LangChain-LLM с кэшированием.
+
+    Ключ строится по отрендеренному промпту, имени модели и температуре.
+    На промахе вызов проходит через :mod:`llm_budget` (модель может быть
+    заменена на более дешёвую).
+    """
+    text = prompt.format(**variables)
+    model = getattr(llm, "model_name", type(llm).__name__)
+    key = make_key(model, [{"role": "user", "content": text}],
+                   temperature=getattr(llm, "temperature", None))
+    max_out = getattr(llm, "max_tokens", None)
+    max_out = max_out if isinstance(max_out, int) and max_out > 0 else 1_000
+
+    def compute() -> str:
+        tokens_in = chunking.count_tokens(text, model)
+        with llm_budget.admit(model, tokens_in, max_out) as ticket, metrics.span("llm") as sp:
+            runner = llm if ticket.model == model else llm.model_copy(
+                update={"model_name": ticket.model})
+            result, used_in, used_out = _invoke(runner, text)
+            sp.tokens_in = used_in or tokens_in
+            sp.tokens_out = used_out or chunking.count_tokens(result, model)
+            ticket.settle(sp.tokens_in, sp.tokens_out)
+        return result
+
+    return get_cache().cached(key, compute)
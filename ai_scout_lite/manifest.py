@@ -0,0 +1,76 @@
+"""Манифест батч-прогона: какие этапы уже сделаны для каждой организации."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+STAGES = ("site_found", "crawled", "site_extracted", "web_extracted", "saved")
+
+
+class Manifest:
+    """Потокобезопасный JSON-манифест; ``path=None`` — только в памяти."""
+
+    def __init__(self, path: Optional[Path]) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._orgs: Dict[str, Dict[str, Any]] = {}
+        if path and path.exists():
+            self._orgs = json.loads(path.read_text(encoding="utf-8")).get("orgs", {})
+
+    def progress(self, org: str) -> "OrgProgress":
+        return OrgProgress(self, org)
+
+    def _entry(self, org: str) -> Dict[str, Any]:
+        return self._orgs.setdefault(org, {"stages": {}, "data": {}})
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"orgs": self._orgs}, ensure_ascii=False, indent=2),
+                       encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+class OrgProgress:
+    """Этапы одной организации внутри :class:`Manifest`."""
+
+    def __init__(self, manifest: Manifest, org: str) -> None:
+        self._m = manifest
+        self.org = org
+
+    @classmethod
+    def detached(cls) -> "OrgProgress":
+        """Прогресс без файла — для вызовов вне ``main.py``."""
+        return cls(Manifest(None), "")
+
+    def done(self, stage: str) -> bool:
+        with self._m._lock:
+            return stage in self._m._orgs.get(self.org, {}).get("stages", {})
+
+    @property
+    def complete(self) -> bool:
+        return self.done(STAGES[-1])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._m._lock:
+            return self._m._orgs.get(self.org, {}).get("data", {}).get(key, default)
+
+    def mark(self, stage: str, **data: Any) -> None:
+        """Отмечает этап выполненным (и сохраняет доп. данные)."""
+        assert stage in STAGES, stage
+        with self._m._lock:
+            entry = self._m._entry(self.org)
+            entry["stages"][stage] = time.strftime("%Y-%m-%dT%H:%M:%S")
+            entry["data"].update(data)
+            self._m._save()
+
+    def reset(self) -> None:
+        with self._m._lock:
+            if self._m._orgs.pop(self.org, None) is not None:
+                self._m._save()
@@ -0,0 +1,222 @@
+"""Метрики и трассировка этапов пайплайна."""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+STAGES = ("search", "browser", "fetch", "extract", "llm", "save")
+
+
+@dataclass
+class StageStats:
+    calls:      int = 0
+    errors:     int = 0
+    seconds:    float = 0.0
+    bytes:      int = 0
+    tokens_in:  int = 0
+    tokens_out: int = 0
+
+
+@dataclass
+class Span:
+    """Поля, которые вызывающий код заполняет внутри :func:`span`."""
+    bytes:      int = 0
+    tokens_in:  int = 0
+    tokens_out: int = 0
+
+
+@dataclass
+class OrgMetrics:
+    org:     str = ""
+    ok:      bool = True
+    seconds: float = 0.0
+    stages:  Dict[str, StageStats] = field(default_factory=dict)
+    events:  Dict[str, float] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float, sp: Span, error: bool) -> None:
+        with self._lock:
+            st = self.stages.setdefault(stage, StageStats())
+            st.calls += 1
+            st.errors += error
+            st.seconds += seconds
+            st.bytes += sp.bytes
+            st.tokens_in += sp.tokens_in
+            st.tokens_out += sp.tokens_out
+
+    def add(self, event: str, value: float) -> None:
+        with self._lock:
+            self.events[event] = self.events.get(event, 0) + value
+
+    def hit_rates(self) -> Dict[str, float]:
+        """Доля попаданий для пар ``<кэш>_hit`` / ``<кэш>_miss``."""
+        caches = {n.rpartition("_")[0] for n in self.events if n.endswith(("_hit", "_miss"))}
+        rates = {}
+        for cache in sorted(caches):
+            hits = self.events.get(f"{cache}_hit", 0)
+            total = hits + self.events.get(f"{cache}_miss", 0)
+            rates[cache] = round(hits / total, 3) if total else 0.0
+        return rates
+
+    def to_json(self) -> str:
+        with self._lock:
+            data = {
+                "org": self.org, "ok": self.ok, "seconds": round(self.seconds, 3),
+                "stages": {k: {**asdict(v), "seconds": round(v.seconds, 3)}
+                           for k, v in sorted(self.stages.items())},
+                "events": {k: round(v, 3) for k, v in sorted(self.events.items())},
+                "hit_rates": self.hit_rates(),
+                "ts": time.time(),
+            }
+        return json.dumps(data, ensure_ascii=False)
+
+
+_current: contextvars.ContextVar[Optional[OrgMetrics]] = contextvars.ContextVar(
+    "ai_scout_metrics", default=None
+)
+_total = OrgMetrics("*")                  # агрегат по процессу — для /metrics
+_orgs: Dict[str, int] = {"ok": 0, "failed": 0}
+_sink: Optional[Path] = None
+_sink_lock = threading.Lock()
+
+
+def _targets() -> List[OrgMetrics]:
+    org = _current.get()
+    return [_total, org] if org is not None else [_total]
+
+
+@contextmanager
+def span(stage: str) -> Iterator[Span]:
+    """Замер одного вызова этапа ``stage``; исключение считается ошибкой."""
+    sp = Span()
+    started = time.perf_counter()
+    error = False
+    try:
+        yield sp
+    except BaseException:
+        error = True
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        for target in _targets():
+            target.record(stage, elapsed, sp, error)
+
+
+def observe(stage: str, seconds: float, bytes: int = 0,
+            tokens_in: int = 0, tokens_out: int = 0) -> None:
+    """Уже измеренный вызов (например, разбор страницы в пуле процессов)."""
+    sp = Span(bytes, tokens_in, tokens_out)
+    for target in _targets():
+        target.record(stage, seconds, sp, False)
+
+
+def add(event: str, value: float = 1) -> None:
+    """Счётчик события: ``llm_cache_hit``, ``search_retry``, ``ratelimit_wait_seconds``…"""
+    for target in _targets():
+        target.add(event, value)
+
+
+def current() -> Optional[OrgMetrics]:
+    return _current.get()
+
+
+def total() -> OrgMetrics:
+    """Агрегат по всему процессу."""
+    return _total
+
+
+@contextmanager
+def track(org: str) -> Iterator[OrgMetrics]:
+    """Метрики одной организации; по выходу — JSON-строка в файл :func:`configure`."""
+    m = OrgMetrics(org)
+    token = _current.set(m)
+    started = time.perf_counter()
+    try:
+        yield m
+    except BaseException:
+        m.ok = False
+        raise
+    finally:
+        _current.reset(token)
+        m.seconds = time.perf_counter() - started
+        with _sink_lock:
+            _orgs["ok" if m.ok else "failed"] += 1
+            if _sink is not None:
+                with open(_sink, "a", encoding="utf-8") as fh:
+                    fh.write(m.to_json() + "\n")
+
+
+def configure(jsonl: str | Path | None) -> None:
+    """Куда дописывать JSON-строки по организациям (``None`` — никуда)."""
+    global _sink
+    with _sink_lock:
+        _sink = Path(jsonl) if jsonl else None
+
+
+def render_prometheus() -> str:
+    """Агрегат по процессу в текстовом формате Prometheus."""
+    lines: List[str] = []
+
+    def metric(name: str, kind: str, help_: str, samples: List[tuple]) -> None:
+        lines.append(f"# HELP {name} {help_}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            label = ",".join(f'{k}="{v}"' for k, v in labels.items())
+            lines.append(f"{name}{{{label}}} {value:g}" if label else f"{name} {value:g}")
+
+    with _total._lock:
+        stages = {k: StageStats(**asdict(v)) for k, v in _total.stages.items()}
+        events = dict(_total.events)
+    with _sink_lock:
+        orgs = dict(_orgs)
+
+    metric("ai_scout_stage_calls_total", "counter", "Calls per stage.",
+           [({"stage": s}, v.calls) for s, v in stages.items()])
+    metric("ai_scout_stage_errors_total", "counter", "Failed calls per stage.",
+           [({"stage": s}, v.errors) for s, v in stages.items()])
+    metric("ai_scout_stage_seconds_total", "counter", "Time spent per stage.",
+           [({"stage": s}, v.seconds) for s, v in stages.items()])
+    metric("ai_scout_stage_bytes_total", "counter", "Bytes downloaded or written per stage.",
+           [({"stage": s}, v.bytes) for s, v in stages.items()])
+    metric("ai_scout_stage_tokens_total", "counter", "LLM tokens per stage.",
+           [({"stage": s, "direction": d}, getattr(v, f"tokens_{d}"))
+            for s, v in stages.items() for d in ("in", "out")])
+    metric("ai_scout_events_total", "counter", "Cache hits/misses, retries, rate-limit waits.",
+           [({"event": e}, v) for e, v in sorted(events.items())])
+    metric("ai_scout_orgs_total", "counter", "Processed organisations.",
+           [({"status": k}, v) for k, v in orgs.items()])
+    return "\n".join(lines) + "\n"
+
+
+def serve(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Фоновый HTTP-сервер с ``/metrics`` для Prometheus."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -4,13 +4,12 @@ from __future__ import annotations
 
 import urllib.parse
 from dataclasses import dataclass
-from typing import List
+from typing import TYPE_CHECKING, List
 
-import pandas as pd
-from duckduckgo_search import DDGS
-import requests_cache
+from . import search
 
-requests_cache.install_cache("ai_scout_cache")
+if TYPE_CHECKING:                    # pandas грузится при первом вызове
+    import pandas as pd
 
 
 @dataclass
@@ -23,17 +22,14 @@ class Partner:
 
 
 def search_duckduckgo(query: str, max_results: int = 10) -> List[str]:
-    """Поиск ссылок. TODO: заменить на Perplexity API."""
-    links: List[str] = []
-    with DDGS() as ddgs:
-        for r in ddgs.text(query, max_results=max_results):
-            if r.get("href"):
-                links.append(r["href"])
-    return links
+    """Поиск ссылок (общий кэширующий клиент). TODO: заменить на Perplexity API."""
+    return search.search(query, max_results=max_results)
 
 
 def find_partners(org: str, max_results: int = 5) -> pd.DataFrame:
     """Ищем упоминания индустриальных партнёров."""
+    import pandas as pd
+
     partners: List[Partner] = []
     for url in search_duckduckgo(f"{org} industrial partner", max_results=max_results):
         name = urllib.parse.urlparse(url).netloc.split(".")[0]
@@ -3,17 +3,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List
 
-from langchain_openai import OpenAI
-#from langchain.llms import OpenAI
-from langchain.prompts import PromptTemplate
+from . import llm_cache
 
 PROMPT_PILOT_GEN = """
 Составь черновик пилотного проекта внедрения ИИ для организации «{org}».
 Используй проблему: {task}; релевантный AI-кейс: {case_task};
 индустриальный партнёр: {partner}. Формат:
- {title}
+ {{title}}
  • Problem: ...
  • AI Solution: ...
  • Partner: ...
@@ -31,13 +28,17 @@ class PilotProject:
 
 def generate_pilot(org: str, task: str, case_task: str, partner: str) -> PilotProject:
     """Создаём текст пилотного проекта."""
+    from langchain.prompts import PromptTemplate     # langchain — только когда нужен
+    from langchain_openai import OpenAI
+
     llm = OpenAI(temperature=0)
     prompt = PromptTemplate(
         template=PROMPT_PILOT_GEN,
         input_variables=["org", "task", "case_task", "partner"],
     )
-    chain = prompt | llm
-    text = chain.invoke({"org": org, "task": task, "case_task": case_task, "partner": partner})
+    text = llm_cache.cached_invoke(
+        prompt, llm, {"org": org, "task": task, "case_task": case_task, "partner": partner}
+    )
     lines = text.split("\n", 1)  # отделяем заголовок от тела
     title = lines[0].strip() if lines else "Пилот"
     body = lines[1].strip() if len(lines) > 1 else ""
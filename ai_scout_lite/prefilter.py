@@ -0,0 +1,172 @@
+"""Дешёвый локальный фильтр страниц перед LLM-классификатором AI-кейсов."""
+
+from __future__ import annotations
+
+import math
+import os
+import random
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import metrics
+
+THRESHOLD = 2.0
+AUDIT_RATE = 0.1
+STRONG = 3.0
+WEAK = 0.5
+MAX_SAMPLES = 10_000          # вердиктов LLM, хранимых для sweep()
+
+_STRONG_TERMS = (
+    r"искусственн\w* интеллект\w*", r"\bии\b", r"\bai\b", r"\bml\b", r"\bllm\b",
+    r"нейросет\w*", r"нейронн\w* сет\w*", r"машинн\w* обучени\w*", r"глубок\w* обучени\w*",
+    r"обучени\w* с подкреплением", r"компьютерн\w* зрени\w*", r"языков\w* модел\w*",
+    r"градиентн\w* бустинг\w*", r"случайн\w* лес\w*",
+    r"artificial intelligence", r"machine learning", r"deep learning", r"neural net\w*",
+    r"reinforcement learning", r"computer vision", r"gradient boosting",
+    r"random forest", r"data science",
+)
+_WEAK_TERMS = (
+    r"модел\w*", r"прогноз\w*", r"классификац\w*", r"алгоритм\w*", r"датасет\w*",
+    r"набор\w* данных", r"обучающ\w* выборк\w*", r"точност\w*", r"автоматизац\w*",
+    r"model\w*", r"predict\w*", r"classif\w*", r"algorithm\w*", r"dataset\w*", r"accuracy",
+)
+
+
+def _pattern(terms: Iterable[str], prefix: str) -> str:
+    return "|".join(f"(?P<{prefix}{i}>{t})" for i, t in enumerate(terms))
+
+
+_TERMS = re.compile(_pattern(_STRONG_TERMS, "s") + "|" + _pattern(_WEAK_TERMS, "w"), re.I)
+
+
+def score(text: str) -> float:
+    """Словарный балл «про ИИ ли это» (0 — ни одного термина)."""
+    counts = Counter(m.lastgroup for m in _TERMS.finditer(text))
+    return sum((STRONG if name[0] == "s" else WEAK) * math.log1p(n)
+               for name, n in counts.items())
+
+
+@dataclass
+class Decision:
+    score: float
+    skip:  bool            # ниже порога — в LLM не отправляем
+    audit: bool = False    # …но эта страница выбрана для контрольной проверки
+
+    @property
+    def call_llm(self) -> bool:
+        return not self.skip or self.audit
+
+
+@dataclass
+class PrefilterStats:
+    pages:          int = 0
+    skipped:        int = 0      # LLM не вызывался
+    audited:        int = 0      # ниже порога, но проверены LLM
+    audit_missed:   int = 0      # … и LLM нашёл кейс (ложный негатив фильтра)
+    passed:         int = 0      # выше порога, ушли в LLM
+    passed_positive: int = 0     # … и LLM подтвердил кейс
+
+    @property
+    def skip_rate(self) -> float:
+        return self.skipped / self.pages if self.pages else 0.0
+
+    @property
+    def agreement(self) -> float:
+        """Совпадение с LLM: аудит-негативы + подтверждённые «выше порога»."""
+        judged = self.audited + self.passed
+        agreed = (self.audited - self.audit_missed) + self.passed_positive
+        return agreed / judged if judged else 0.0
+
+    @property
+    def miss_rate(self) -> float:
+        """Оценка доли кейсов среди отсеянных (по аудиту)."""
+        return self.audit_missed / self.audited if self.audited else 0.0
+
+
+class CasePrefilter:
+    """Порог по :func:`score` с аудитом отсеянных страниц."""
+
+    def __init__(self, threshold: Optional[float] = THRESHOLD, audit_rate: float = AUDIT_RATE,
+                 rng: Optional[random.Random] = None) -> None:
+        self.threshold = threshold           # None — фильтр выключен, всё идёт в LLM
+        self.audit_rate = audit_rate
+        self.stats = PrefilterStats()
+        self._samples: List[Tuple[float, bool, float]] = []   # (балл, вердикт LLM, вес)
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+
+    def decide(self, text: str) -> Decision:
+        value = score(text)
+        skip = self.threshold is not None and value < self.threshold
+        with self._lock:
+            audit = skip and self._rng.random() < self.audit_rate
+            self.stats.pages += 1
+            if skip and not audit:
+                self.stats.skipped += 1
+        metrics.add("prefilter_skip" if skip and not audit else
+                    "prefilter_audit" if audit else "prefilter_pass")
+        return Decision(value, skip, audit)
+
+    def record(self, decision: Decision, is_case: bool) -> None:
+        """Вердикт LLM по странице, которую фильтр отправил в LLM."""
+        if not decision.call_llm:
+            return
+        with self._lock:
+            if decision.audit:
+                self.stats.audited += 1
+                self.stats.audit_missed += is_case
+            else:
+                self.stats.passed += 1
+                self.stats.passed_positive += is_case
+            if len(self._samples) < MAX_SAMPLES:
+                # отсеянные попадают в выборку с вероятностью audit_rate — взвешиваем обратно
+                weight = 1 / self.audit_rate if decision.audit else 1.0
+                self._samples.append((decision.score, is_case, weight))
+        if decision.audit and is_case:
+            metrics.add("prefilter_miss")
+
+    def sweep(self, thresholds: Iterable[float]) -> List[Dict[str, float]]:
+        """Доля пропущенных вызовов LLM и потерянных кейсов для других порогов."""
+        with self._lock:
+            samples = list(self._samples)
+        total = sum(w for _, _, w in samples)
+        cases = sum(w for _, hit, w in samples if hit)
+        rows = []
+        for t in thresholds:
+            below = [(hit, w) for s, hit, w in samples if s < t]
+            rows.append({
+                "threshold": t,
+                "skip_rate": round(sum(w for _, w in below) / total, 3) if total else 0.0,
+                "lost_cases": round(sum(w for hit, w in below if hit) / cases, 3) if cases else 0.0,
+            })
+        return rows
+
+    def report(self) -> str:
+        s = self.stats
+        if self.threshold is None:
+            return "префильтр кейсов выключен"
+        return (f"префильтр кейсов (порог {self.threshold:g}): {s.pages} стр., "
+                f"без LLM {s.skipped} ({s.skip_rate:0.0%}); согласие с LLM {s.agreement:0.0%}, "
+                f"аудит {s.audited} стр., из них кейсов {s.audit_missed} ({s.miss_rate:0.0%})")
+
+
+def _from_env() -> CasePrefilter:
+    value = os.getenv("AI_SCOUT_CASE_PREFILTER", "").strip().lower()
+    threshold = None if value == "off" else float(value) if value else THRESHOLD
+    return CasePrefilter(threshold, float(os.getenv("AI_SCOUT_CASE_AUDIT", str(AUDIT_RATE))))
+
+
+_filter: Optional[CasePrefilter] = None
+_filter_lock = threading.Lock()
+
+
+def get_filter() -> CasePrefilter:
+    """Общий на процесс фильтр."""
+    global _filter
+    with _filter_lock:
+        if _filter is None:
+            _filter = _from_env()
+        return _filter
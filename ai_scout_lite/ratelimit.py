@@ -0,0 +1,170 @@
+"""Единый rate-limiter для всех исходящих запросов."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+from . import metrics
+
+# ключ → (запросов в секунду, burst)
+DEFAULT_RATES: Dict[str, Tuple[float, float]] = {
+    "ddg":         (0.4, 1),     # duckduckgo_search / DDGS
+    "ddg-browser": (0.5, 1),     # headless Firefox на duckduckgo.com
+    "*":           (2.0, 2),     # любой другой хост
+}
+MAX_RETRY_AFTER = 120.0          # не верим Retry-After длиннее двух минут
+
+
+@dataclass
+class BucketStats:
+    """Счётчики ожидания по одному ключу."""
+
+    calls:     int = 0
+    throttled: int = 0           # сколько вызовов пришлось придержать
+    waited:    float = 0.0       # суммарное ожидание, сек
+
+
+class TokenBucket:
+    """Потокобезопасное ведро токенов с поддержкой Retry-After."""
+
+    def __init__(self, rate: float, burst: float = 1) -> None:
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.stats = BucketStats()
+        self._tokens = self.burst
+        self._stamp = time.monotonic()       # момент, на который посчитаны _tokens
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Забирает токен и возвращает, сколько секунд надо подождать."""
+        with self._lock:
+            now = time.monotonic()
+            if now > self._stamp:                # после block() _stamp может быть в будущем
+                self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+            self._tokens -= 1
+            delay = self._stamp - now + (-self._tokens / self.rate if self._tokens < 0 else 0.0)
+
+            self.stats.calls += 1
+            if delay > 0:
+                self.stats.throttled += 1
+                self.stats.waited += delay
+            return delay
+
+    def block(self, seconds: float) -> None:
+        """Запрещает запросы на ``seconds`` сек (ответ 429 / Retry-After).
+
+        Ведро к концу блокировки пустое: ждавшие запросы уходят после неё
+        с обычным интервалом, а не все разом.
+        """
+        with self._lock:
+            until = time.monotonic() + min(seconds, MAX_RETRY_AFTER)
+            if until > self._stamp:
+                now = time.monotonic()
+                if now > self._stamp:
+                    self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+                self._tokens = min(self._tokens, 0.0)
+                self._stamp = until
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_rates: Dict[str, Tuple[float, float]] = dict(DEFAULT_RATES)
+_registry_lock = threading.Lock()
+
+
+def _load_env() -> None:
+    for item in os.getenv("AI_SCOUT_RATES", "").split(","):
+        if "=" not in item:
+            continue
+        key, spec = item.split("=", 1)
+        rate, _, burst = spec.partition(":")
+        _rates[key.strip()] = (float(rate), float(burst or 1))
+
+
+_load_env()
+
+
+def configure(key: str, rate: float, burst: float = 1) -> None:
+    """Задаёт скорость для ключа (пересоздаёт ведро)."""
+    with _registry_lock:
+        _rates[key] = (rate, burst)
+        _buckets.pop(key, None)
+
+
+def bucket(key: str) -> TokenBucket:
+    with _registry_lock:
+        if key not in _buckets:
+            rate, burst = _rates.get(key, _rates["*"])
+            _buckets[key] = TokenBucket(rate, burst)
+        return _buckets[key]
+
+
+def host_key(url: str) -> str:
+    """Ключ лимитера для URL — хост без ``www.``."""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def _record_wait(delay: float) -> None:
+    metrics.add("ratelimit_wait")
+    metrics.add("ratelimit_wait_seconds", delay)
+
+
+def wait(key: str) -> float:
+    """Блокирующее ожидание слота; возвращает фактическую паузу."""
+    delay = bucket(key).reserve()
+    if delay > 0:
+        _record_wait(delay)
+        time.sleep(delay)
+    return delay
+
+
+async def wait_async(key: str) -> float:
+    """То же, что :func:`wait`, но не блокирует event loop."""
+    delay = bucket(key).reserve()
+    if delay > 0:
+        _record_wait(delay)
+        await asyncio.sleep(delay)
+    return delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After в секундах (число или HTTP-дата) либо ``None``."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after(key: str, value: Optional[str | float], default: float = 0.0) -> None:
+    """Учитывает Retry-After (или ``default`` сек, если заголовка нет)."""
+    seconds = value if isinstance(value, (int, float)) else parse_retry_after(value)
+    seconds = default if seconds is None else seconds
+    if seconds > 0:
+        bucket(key).block(seconds)
+
+
+def check_status(key: str, status: int, headers: Mapping[str, str]) -> None:
+    """429 / 503 от сервера — пауза для ``key`` по Retry-After (любой путь загрузки)."""
+    if status in (429, 503):
+        retry_after(key, headers.get("Retry-After"))
+
+
+def stats() -> Dict[str, BucketStats]:
+    """Счётчики ожидания по всем ключам (копия)."""
+    with _registry_lock:
+        return {k: BucketStats(**vars(b.stats)) for k, b in _buckets.items()}
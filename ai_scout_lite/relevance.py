@@ -0,0 +1,127 @@
+"""Оценка ссылок и страниц сайта по полям ``OrgInfo`` для best-first обхода."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Set, Tuple
+from urllib.parse import unquote, urlparse
+
+FIELDS = ("science", "activities", "results", "commercial", "partners")
+
+# поле → (основы слов для анкора и текста, начала токенов пути URL)
+FIELD_TERMS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "science": (
+        ("наук", "научн", "исследов", "лаборатор", "направлен", "research", "scien", "laborator"),
+        ("nauk", "nauch", "scien", "research", "issled", "lab", "napravl"),
+    ),
+    "activities": (
+        ("деятельност", "услуг", "продукц", "производств", "разработк", "проект",
+         "activit", "servic", "product", "project"),
+        ("deyat", "activit", "uslug", "servic", "product", "produk", "proekt", "project", "razrab"),
+    ),
+    "results": (
+        ("результат", "достижен", "отчет", "отчёт", "публикац", "патент",
+         "result", "achievement", "report", "publication", "patent"),
+        ("rezult", "result", "dostizh", "achiev", "otchet", "report", "annual",
+         "publik", "public", "patent"),
+    ),
+    "commercial": (
+        ("коммерциал", "трансфер", "инновац", "внедрен", "лиценз", "заказчик", "индустри",
+         "commerc", "innovat", "transfer", "licens", "industr"),
+        ("kommerc", "commerc", "innovac", "innovat", "transfer", "licen", "industr", "vnedr"),
+    ),
+    "partners": (
+        ("партнер", "партнёр", "сотрудничеств", "кооперац", "консорциум",
+         "partner", "cooperat", "collaborat"),
+        ("partner", "sotrud", "cooper", "collab", "konsorc", "consort"),
+    ),
+}
+# служебные разделы: основы слов анкора и начала токенов пути
+NOISE_TERMS: Tuple[Tuple[str, ...], Tuple[str, ...]] = (
+    ("контакт", "ваканс", "закупк", "коррупц", "карта сайта", "вход", "регистрац", "поиск",
+     "фото", "галере", "слабовидящ", "архив", "новост", "объявлен",
+     "contact", "vacanc", "career", "login", "search", "gallery", "archive", "news", "sitemap"),
+    ("contact", "kontakt", "vacanc", "vakans", "job", "career", "news", "novost", "archiv",
+     "arhiv", "zakupk", "tender", "korrup", "corrup", "protivod", "login", "auth", "search",
+     "poisk", "gallery", "foto", "photo", "sitemap", "print", "rss", "tag", "calendar"),
+)
+
+ANCHOR_WEIGHT = 2.0       # за поле, найденное в тексте ссылки
+PATH_WEIGHT = 1.0         # … в пути URL
+NOISE_WEIGHT = -3.0
+DEPTH_WEIGHT = -0.5       # за уровень обхода от главной
+SEGMENT_WEIGHT = -0.1     # за сегмент пути глубже первого
+QUERY_WEIGHT = -0.5       # ?page=2, ?sort=… — чаще листинги, чем содержание
+
+TEXT_HITS = 3             # столько упоминаний поля на странице — поле покрыто
+ENOUGH_CHARS = 40_000     # ≈ один кусок CHUNK_TOKENS для _extract_info
+MIN_FIELDS = 4            # из пяти полей OrgInfo
+
+_TOKEN = re.compile(r"[^\w]+")
+
+
+def _path_tokens(url: str) -> Tuple[str, ...]:
+    path = unquote(urlparse(url).path).lower()
+    return tuple(t for t in _TOKEN.split(path) if t)
+
+
+def _anchor_hit(anchor: str, stems: Tuple[str, ...]) -> bool:
+    return any(s in anchor for s in stems)
+
+
+def _path_hit(tokens: Tuple[str, ...], stems: Tuple[str, ...]) -> bool:
+    return any(t.startswith(s) for t in tokens for s in stems)
+
+
+def link_fields(url: str, anchor: str = "") -> Set[str]:
+    """Поля ``OrgInfo``, на которые указывает ссылка (по анкору или пути)."""
+    anchor, tokens = anchor.lower(), _path_tokens(url)
+    return {f for f, (words, paths) in FIELD_TERMS.items()
+            if _anchor_hit(anchor, words) or _path_hit(tokens, paths)}
+
+
+def score_link(url: str, anchor: str = "", depth: int = 1) -> float:
+    """Приоритет ссылки для обхода (больше — раньше)."""
+    anchor, tokens = anchor.lower(), _path_tokens(url)
+    score = 0.0
+    for words, paths in FIELD_TERMS.values():
+        score += ANCHOR_WEIGHT * _anchor_hit(anchor, words)
+        score += PATH_WEIGHT * _path_hit(tokens, paths)
+    if _anchor_hit(anchor, NOISE_TERMS[0]) or _path_hit(tokens, NOISE_TERMS[1]):
+        score += NOISE_WEIGHT
+    score += DEPTH_WEIGHT * depth
+    score += SEGMENT_WEIGHT * max(0, len(urlparse(url).path.strip("/").split("/")) - 1)
+    score += QUERY_WEIGHT * bool(urlparse(url).query)
+    return score
+
+
+def text_fields(text: str) -> Set[str]:
+    """Поля, упомянутые на странице не меньше ``TEXT_HITS`` раз."""
+    low = text.lower()
+    return {f for f, (words, _) in FIELD_TERMS.items()
+            if sum(low.count(w) for w in words) >= TEXT_HITS}
+
+
+@dataclass
+class Coverage:
+    """Релевантный текст, собранный обходом, и покрытые им поля."""
+
+    enough_chars: int = ENOUGH_CHARS     # 0 — не останавливаться досрочно
+    min_fields:   int = MIN_FIELDS
+    chars:        int = 0
+    pages:        int = 0
+    fields:       Set[str] = field(default_factory=set)
+
+    def add(self, text: str) -> bool:
+        """Учитывает страницу; ``True`` — она касается хотя бы одного поля."""
+        found = text_fields(text)
+        if found:
+            self.chars += len(text)
+            self.pages += 1
+            self.fields |= found
+        return bool(found)
+
+    def enough(self) -> bool:
+        return (self.enough_chars > 0 and self.chars >= self.enough_chars
+                and len(self.fields) >= self.min_fields)
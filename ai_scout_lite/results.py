@@ -0,0 +1,268 @@
+"""Единое хранилище результатов по всем организациям и прогонам."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+STORE_PATH = "results.sqlite"
+FIELDS = ("science", "activities", "results", "commercial", "partners")
+SOURCES = ("site", "web")
+_SPACES = re.compile(r"\s+")
+_FTS_MIN_CHARS = 3                          # триграммный индекс ищет от трёх символов
+
+# внешний FTS5-индекс над items.norm; триггеры держат его в синхроне с items
+_FTS_SCHEMA = (
+    "CREATE VIRTUAL TABLE items_fts USING fts5("
+    " norm, content='items', content_rowid='rowid', tokenize='trigram');"
+    "CREATE TRIGGER IF NOT EXISTS items_fts_ins AFTER INSERT ON items BEGIN"
+    " INSERT INTO items_fts (rowid, norm) VALUES (new.rowid, new.norm); END;"
+    "CREATE TRIGGER IF NOT EXISTS items_fts_del AFTER DELETE ON items BEGIN"
+    " INSERT INTO items_fts (items_fts, rowid, norm) VALUES ('delete', old.rowid, old.norm); END;"
+    "INSERT INTO items_fts (items_fts) VALUES ('rebuild');"
+)
+
+
+def normalize(value: str) -> str:
+    """Ключ для поиска: нижний регистр, ё → е, без кавычек и лишних пробелов."""
+    value = value.lower().replace("ё", "е")
+    value = re.sub(r"[«»\"'“”„]", "", value)
+    return _SPACES.sub(" ", value).strip()
+
+
+def new_run_id() -> str:
+    return time.strftime("%Y%m%d-%H%M%S")
+
+
+class ResultsStore:
+    """SQLite-хранилище итогов (потокобезопасное)."""
+
+    def __init__(self, path: str | Path = STORE_PATH) -> None:
+        self.path = Path(path)
+        self.run_id: Optional[str] = None           # прогон, в который пишет put()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " run TEXT PRIMARY KEY, started REAL);"
+            "CREATE TABLE IF NOT EXISTS infos ("
+            " run TEXT, org TEXT, source TEXT, site_url TEXT, data TEXT, updated REAL,"
+            " PRIMARY KEY (run, org, source));"
+            "CREATE TABLE IF NOT EXISTS items ("
+            " run TEXT, org TEXT, source TEXT, field TEXT, pos INTEGER,"
+            " value TEXT, norm TEXT);"
+            "CREATE INDEX IF NOT EXISTS items_field ON items (field, run, norm);"
+            "CREATE INDEX IF NOT EXISTS items_org ON items (run, org, source);"
+        )
+        self._fts = self._init_fts()
+
+    def _init_fts(self) -> bool:
+        """Создаёт ``items_fts`` (в старой базе — по уже записанным пунктам)."""
+        if self._db.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'items_fts'").fetchone():
+            return True
+        try:
+            self._db.executescript("BEGIN;" + _FTS_SCHEMA + "COMMIT;")
+        except sqlite3.OperationalError:            # нет FTS5 или tokenize='trigram'
+            if self._db.in_transaction:
+                self._db.rollback()
+            return False
+        return True
+
+    def begin(self, run_id: Optional[str] = None, resume: bool = False) -> str:
+        """Начинает прогон (``resume`` — продолжает последний, если он есть)."""
+        run_id = run_id or (self.latest_run() if resume else None) or new_run_id()
+        with self._lock:
+            self._db.execute("INSERT OR IGNORE INTO runs VALUES (?, ?)", (run_id, time.time()))
+            self._db.commit()
+        self.run_id = run_id
+        return run_id
+
+    # ── запись ──────────────────────────────────────────────────────
+    def put(self, org: str, source: str, info: Dict[str, List[str]], site_url: str = "") -> None:
+        """Итог организации из источника ``source``; повтор в том же прогоне заменяет."""
+        assert source in SOURCES, source
+        assert self.run_id, "ResultsStore.begin() не вызван"
+        key = (self.run_id, org, source)
+        rows = [(*key, f, pos, v, normalize(v))
+                for f in FIELDS for pos, v in enumerate(info.get(f) or []) if v]
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM items WHERE run = ? AND org = ? AND source = ?", key)
+            self._db.execute(
+                "INSERT OR REPLACE INTO infos VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, site_url, json.dumps(info, ensure_ascii=False), time.time()),
+            )
+            self._db.executemany("INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+    # ── чтение ──────────────────────────────────────────────────────
+    def runs(self) -> List[str]:
+        with self._lock:
+            return [r for (r,) in self._db.execute("SELECT run FROM runs ORDER BY started")]
+
+    def latest_run(self) -> Optional[str]:
+        """Последний прогон, в котором есть результаты."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT run FROM runs WHERE run IN (SELECT DISTINCT run FROM infos)"
+                " ORDER BY started DESC LIMIT 1"
+            ).fetchone()
+        return row[0] if row else None
+
+    def _run(self, run: Optional[str]) -> Optional[str]:
+        return run or self.run_id or self.latest_run()
+
+    def orgs(self, run: Optional[str] = None) -> List[str]:
+        run = self._run(run)                        # до захвата lock: latest_run() берёт его сам
+        with self._lock:
+            return [o for (o,) in self._db.execute(
+                "SELECT DISTINCT org FROM infos WHERE run = ? ORDER BY org", (run,))]
+
+    def get(self, org: str, source: str,
+            run: Optional[str] = None) -> Optional[Tuple[Dict[str, List[str]], str]]:
+        """``(info, site_url)`` или ``None``."""
+        run = self._run(run)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data, site_url FROM infos WHERE run = ? AND org = ? AND source = ?",
+                (run, org, source),
+            ).fetchone()
+        return (json.loads(row[0]), row[1] or "") if row else None
+
+    def search(self, field: str, text: str,
+               run: Optional[str] = None) -> List[Tuple[str, str, str]]:
+        """``(org, source, value)`` для пунктов ``field``, содержащих ``text``."""
+        assert field in FIELDS, field
+        run, needle = self._run(run), normalize(text)
+        if self._fts and len(needle) >= _FTS_MIN_CHARS:
+            # фраза из триграмм = подстрока; CROSS JOIN — чтобы план шёл от
+            # FTS-кандидатов к items по rowid, а не перебором items_field
+            sql = ("SELECT i.org, i.source, i.value FROM items_fts CROSS JOIN items AS i"
+                   " ON i.rowid = items_fts.rowid WHERE items_fts MATCH ?"
+                   " AND i.field = ? AND i.run = ? AND instr(i.norm, ?) > 0")
+            args: tuple = ('"' + needle.replace('"', '""') + '"', field, run, needle)
+        else:
+            sql = ("SELECT org, source, value FROM items AS i"
+                   " WHERE field = ? AND run = ? AND instr(norm, ?) > 0")
+            args = (field, run, needle)
+        with self._lock:
+            return self._db.execute(sql + " ORDER BY i.org, i.source, i.pos", args).fetchall()
+
+    def orgs_with(self, field: str, text: str, run: Optional[str] = None) -> List[str]:
+        """Организации, у которых в ``field`` есть ``text`` («все партнёры X»)."""
+        return sorted({org for org, _, _ in self.search(field, text, run)})
+
+    # ── отчёты и выгрузка ───────────────────────────────────────────
+    def report(self, org: str, run: Optional[str] = None) -> str:
+        """Markdown-отчёт организации: сайт и открытые источники."""
+        from .discover import OrgInfo, info_as_text
+
+        parts = [f"# {org}"]
+        for source, title in (("site", "Официальный сайт"), ("web", "Открытые источники")):
+            found = self.get(org, source, run)
+            if found is None:
+                continue
+            info, site_url = found
+            parts.append(f"\n## {title}" + (f" ({site_url})" if site_url else "") + "\n")
+            parts.append(info_as_text(OrgInfo(**{k: info.get(k, []) for k in FIELDS})))
+        return "\n".join(parts) + "\n"
+
+    def rows(self, run: Optional[str] = None, all_runs: bool = False) -> List[tuple]:
+        """Все пункты длинной таблицей: ``(run, org, source, field, pos, value)``."""
+        sql = "SELECT run, org, source, field, pos, value FROM items"
+        args: tuple = ()
+        if not all_runs:
+            sql, args = sql + " WHERE run = ?", (self._run(run),)
+        with self._lock:
+            return self._db.execute(sql + " ORDER BY run, org, source, field, pos", args).fetchall()
+
+    def export(self, path: str | Path, run: Optional[str] = None, all_runs: bool = False) -> int:
+        """Выгрузка в ``.parquet`` (нужен pyarrow) или ``.csv``; возвращает число строк."""
+        import pandas as pd
+
+        path = Path(path)
+        df = pd.DataFrame(self.rows(run, all_runs),
+                          columns=["run", "org", "source", "field", "pos", "value"])
+        if path.suffix == ".parquet":
+            df.to_parquet(path, index=False)
+        else:
+            df.to_csv(path, index=False)
+        return len(df)
+
+
+_store: Optional[ResultsStore] = None
+
+
+def enable(path: str | Path = STORE_PATH, run_id: Optional[str] = None,
+           resume: bool = False) -> ResultsStore:
+    """Включает запись итогов для всего процесса (см. :meth:`ResultsStore.begin`)."""
+    global _store
+    if _store is None:
+        _store = ResultsStore(path)
+        _store.begin(run_id, resume)
+    return _store
+
+
+def get_store() -> Optional[ResultsStore]:
+    return _store
+
+
+def _cli() -> None:
+    parser = argparse.ArgumentParser(prog="python -m ai_scout_lite.results")
+    parser.add_argument("--db", default=str(Path("output") / STORE_PATH), help="путь к базе")
+    parser.add_argument("--run", help="прогон (по умолчанию последний)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("runs", help="список прогонов")
+    sub.add_parser("orgs", help="организации прогона")
+    find = sub.add_parser("find", help="поиск по полю")
+    find.add_argument("field", choices=FIELDS)
+    find.add_argument("text")
+    partners = sub.add_parser("partners", help="все институты, партнёр которых — TEXT")
+    partners.add_argument("text")
+    report = sub.add_parser("report", help="md-отчёт организации")
+    report.add_argument("org", nargs="?")
+    report.add_argument("--all", action="store_true", help="по всем организациям прогона")
+    report.add_argument("--dir", help="писать <org>.md в каталог, а не в stdout")
+    export = sub.add_parser("export", help="выгрузка в .parquet / .csv")
+    export.add_argument("path")
+    export.add_argument("--all-runs", action="store_true")
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        parser.error(f"нет базы {args.db}")
+    store = ResultsStore(args.db)
+    run = args.run
+    if args.cmd == "runs":
+        print("\n".join(store.runs()))
+    elif args.cmd == "orgs":
+        print("\n".join(store.orgs(run)))
+    elif args.cmd == "find":
+        for org, source, value in store.search(args.field, args.text, run):
+            print(f"{org}\t{source}\t{value}")
+    elif args.cmd == "partners":
+        print("\n".join(store.orgs_with("partners", args.text, run)))
+    elif args.cmd == "report":
+        orgs = store.orgs(run) if args.all else [args.org] if args.org else []
+        if not orgs:
+            parser.error("укажите организацию или --all")
+        for org in orgs:
+            text = store.report(org, run)
+            if args.dir:
+                Path(args.dir).mkdir(parents=True, exist_ok=True)
+                (Path(args.dir) / f"{org.replace(' ', '_')}.md").write_text(text, encoding="utf-8")
+            else:
+                print(text)
+    else:
+        try:
+            print(f"{store.export(args.path, run, args.all_runs)} строк → {args.path}")
+        except ImportError as exc:                  # .parquet без pyarrow
+            parser.error(f"{exc}\nустановите pyarrow или выгружайте в .csv")
+
+
+if __name__ == "__main__":
+    _cli()
@@ -0,0 +1,87 @@
+"""Оценка «похожести» URL на официальный сайт организации."""
+
+from __future__ import annotations
+
+import re
+import urllib.parse
+from typing import Dict, Iterable, List, Tuple
+
+from transliterate import translit
+
+SCIENCE_ZONES = (
+    "ras.ru", "ran.ru", "nsc.ru",        # Сибирское
+    "sbras.ru", "febras.ru", "ural.ru",  # отделения РАН
+    "iacp.dvo.ru", "ru/science",         # пример
+)
+EXCLUDED = (".wikipedia.org", ".academic.ru")
+
+# вклад каждого признака в итоговый балл (сумма обрезается до 1.0)
+WEIGHTS = {
+    "abbr":  0.5,     # полное совпадение аббревиатуры
+    "first": 0.35,    # транслит первого значимого слова
+    "ngram": 0.25,    # ≥3 подряд букв аббревиатуры
+    "stem":  0.25,    # основа длинного слова (≥6 букв)
+    "zone":  0.3,     # поддомен научного кластера
+}
+
+
+def _lat(word: str) -> str:
+    return translit(word, "ru", reversed=True).lower()
+
+
+class OfficialScorer:
+    """Оценщик кандидатов в официальные сайты одной организации."""
+
+    def __init__(self, clean: str, abbr: str) -> None:
+        tokens: Dict[str, set] = {}
+
+        def add(token: str, kind: str) -> None:
+            if token:
+                tokens.setdefault(token, set()).add(kind)
+
+        words = clean.split()
+        if words:
+            add(_lat(words[0]), "first")
+        for word in words:
+            if len(word) >= 6:
+                add(_lat(word[:5]), "stem")
+        for variant in {abbr.lower(), _lat(abbr)}:
+            add(variant, "abbr")
+            for i in range(len(variant) - 2):
+                add(variant[i:i + 3], "ngram")
+
+        # в позиции p regex находит самый длинный токен; все более короткие
+        # совпадения в той же позиции — его префиксы, их признаки тоже засчитываем
+        self._kinds = {
+            tok: set().union(*(k for t, k in tokens.items() if tok.startswith(t)))
+            for tok in tokens
+        }
+        alternatives = "|".join(re.escape(t) for t in sorted(tokens, key=len, reverse=True))
+        self._pattern = re.compile(f"(?=({alternatives}))") if alternatives else None
+        self._cache: Dict[str, float] = {}
+
+    def _host_score(self, host: str) -> float:
+        if any(bad in host for bad in EXCLUDED):
+            return 0.0
+        kinds = set()
+        if self._pattern is not None:
+            for m in self._pattern.finditer(host):
+                kinds |= self._kinds[m.group(1)]
+        if host.endswith(SCIENCE_ZONES):
+            kinds.add("zone")
+        return min(1.0, sum(WEIGHTS[k] for k in kinds))
+
+    def score(self, url: str) -> float:
+        host = urllib.parse.urlparse(url).netloc.lower()
+        if host not in self._cache:
+            self._cache[host] = self._host_score(host)
+        return self._cache[host]
+
+    def score_many(self, urls: Iterable[str]) -> List[float]:
+        return [self.score(u) for u in urls]
+
+    def rank(self, urls: Iterable[str]) -> List[Tuple[str, float]]:
+        """Кандидаты с баллом > 0, от лучшего к худшему (при равенстве — исходный порядок)."""
+        urls = list(urls)
+        scored = [(u, s) for u, s in zip(urls, self.score_many(urls)) if s > 0]
+        return sorted(scored, key=lambda pair: -pair[1])
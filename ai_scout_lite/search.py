@@ -0,0 +1,246 @@
+"""Общий поисковый клиент с подключаемым бэкендом и кэшем результатов."""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Protocol, Tuple
+
+from . import metrics, ratelimit
+from .utils import HEADERS
+
+CACHE_PATH = os.getenv("AI_SCOUT_SEARCH_CACHE", "ai_scout_search_cache.sqlite")
+TTL = 7 * 24 * 3600          # выдача поисковика за неделю почти не меняется
+MAX_ENTRIES = 20_000
+DEFAULT_REGION = "wt-wt"
+_MAX_RETRIES = 3
+
+Key = Tuple[str, str, int]
+_TOKEN = re.compile(r"\w{2,}", re.U)
+
+
+@dataclass
+class SearchStats:
+    hits:     int = 0        # ответ из кэша
+    misses:   int = 0        # реальный запрос
+    shared:   int = 0        # дождались чужого одинакового запроса
+    failures: int = 0
+
+
+class SearchBackend(Protocol):
+    """Поставщик ссылок по текстовому запросу."""
+
+    name: str
+    cacheable: bool       # имеет ли смысл класть ответы в дисковый кэш
+
+    def search(self, query: str, max_results: int, region: str) -> List[str]: ...
+
+
+class DuckDuckGoBackend:
+    """duckduckgo_search с back-off и общим лимитером ``"ddg"``."""
+
+    name = "ddg"
+    cacheable = True
+
+    def search(self, query: str, max_results: int, region: str) -> List[str]:
+        from duckduckgo_search import DDGS          # не грузим, если поиск локальный
+        from duckduckgo_search.exceptions import DuckDuckGoSearchException
+
+        for attempt in range(_MAX_RETRIES):
+            ratelimit.wait("ddg")
+            try:
+                with DDGS(headers=HEADERS, timeout=15) as ddgs:
+                    return [
+                        r["href"]
+                        for r in ddgs.text(query, region=region, max_results=max_results)
+                        if r.get("href")
+                    ]
+            except DuckDuckGoSearchException as err:
+                wait = (2 ** attempt) + random.uniform(0, 1.2)
+                metrics.add("search_retry")
+                logging.warning("DuckDuckGo rate-limit: %s; retry in %.1f s", err, wait)
+                ratelimit.retry_after("ddg", wait)      # пауза общая для всех потоков
+        logging.error("DuckDuckGo: all %d attempts failed for %r", _MAX_RETRIES, query)
+        return []
+
+
+class LocalBackend:
+    """BM25 по корпусу JSONL; индекс строится в памяти при создании."""
+
+    name = "local"
+    cacheable = False
+    k1, b = 1.5, 0.75
+
+    def __init__(self, corpus: str | Path) -> None:
+        self.urls: List[str] = []
+        self._lengths: List[int] = []
+        self._postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        with open(corpus, encoding="utf-8") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                doc = json.loads(line)
+                tokens = _TOKEN.findall(
+                    f"{doc['url']} {doc.get('title', '')} {doc.get('text', '')}".lower()
+                )
+                doc_id = len(self.urls)
+                self.urls.append(doc["url"])
+                self._lengths.append(len(tokens))
+                for term, tf in Counter(tokens).items():
+                    self._postings[term].append((doc_id, tf))
+        self._avg_len = sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+
+    def search(self, query: str, max_results: int, region: str) -> List[str]:
+        n = len(self.urls)
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(_TOKEN.findall(query.lower())):
+            postings = self._postings.get(term, ())
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / self._avg_len)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        best = sorted(scores, key=lambda d: (-scores[d], d))[:max_results]
+        return [self.urls[d] for d in best]
+
+
+class SearchClient:
+    """Поиск ссылок через бэкенд с дисковым кэшем и склейкой запросов."""
+
+    def __init__(self, backend: Optional[SearchBackend] = None, path: str = CACHE_PATH,
+                 ttl: float = TTL, max_entries: int = MAX_ENTRIES) -> None:
+        self.backend = backend or DuckDuckGoBackend()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = SearchStats()
+        self._lock = threading.Lock()
+        self._inflight: Dict[Key, Future] = {}
+        self._db = sqlite3.connect(":memory:" if path.lower() == "off" else path,
+                                   check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS search_cache ("
+            " backend TEXT, query TEXT, region TEXT, max_results INTEGER,"
+            " results TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL,"
+            " PRIMARY KEY (backend, query, region, max_results))"
+        )
+        self._db.commit()
+
+    # ── кэш ──────────────────────────────────────────────────────────
+    def _get_locked(self, key: Key) -> Optional[List[str]]:
+        """Запись кэша; вызывается под ``self._lock``."""
+        if not self.backend.cacheable:
+            return None
+        now = time.time()
+        where = " WHERE backend = ? AND query = ? AND region = ? AND max_results = ?"
+        row = self._db.execute(
+            "SELECT results, created FROM search_cache" + where,
+            (self.backend.name, *key),
+        ).fetchone()
+        if row is None or now - row[1] > self.ttl:
+            return None
+        self._db.execute(
+            "UPDATE search_cache SET accessed = ?" + where,
+            (now, self.backend.name, *key),
+        )
+        self._db.commit()
+        return json.loads(row[0])
+
+    def _put(self, key: Key, results: List[str]) -> None:
+        if not self.backend.cacheable:
+            return
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.backend.name, *key, json.dumps(results, ensure_ascii=False), now, now),
+            )
+            self._db.execute(
+                "DELETE FROM search_cache WHERE rowid IN ("
+                " SELECT rowid FROM search_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+
+    def search(self, query: str, max_results: int = 10,
+               region: str = DEFAULT_REGION) -> List[str]:
+        """Ссылки по запросу: из кэша, из чужого одинакового запроса или от бэкенда."""
+        key: Key = (" ".join(query.split()), region, max_results)
+        # кэш и «запрос уже идёт» — в одной критической секции: владелец пишет
+        # кэш до того, как снимает свой Future, поэтому между проверками
+        # нельзя проскочить и отправить тот же запрос второй раз
+        with self._lock:
+            fut = self._inflight.get(key)
+            cached = self._get_locked(key) if fut is None else None
+            owner = fut is None and cached is None
+            if owner:
+                fut = self._inflight[key] = Future()
+        if cached is not None:
+            self.stats.hits += 1
+            metrics.add("search_cache_hit")
+            return cached
+        if not owner:
+            self.stats.shared += 1
+            metrics.add("search_shared")
+            return list(fut.result())
+
+        self.stats.misses += 1
+        metrics.add("search_cache_miss")
+        try:
+            with metrics.span("search"):
+                results = self.backend.search(key[0], max_results, region)
+            if results:                          # пустую выдачу (часто — бан) не кэшируем
+                self._put(key, results)
+            else:
+                self.stats.failures += 1
+            fut.set_result(results)
+            return results
+        except BaseException as exc:
+            fut.set_exception(exc)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
+_client: Optional[SearchClient] = None
+_client_lock = threading.Lock()
+
+
+def _backend_from_env() -> SearchBackend:
+    spec = os.getenv("AI_SCOUT_SEARCH_BACKEND", "ddg")
+    if spec.startswith("local:"):
+        return LocalBackend(spec[len("local:"):])
+    return DuckDuckGoBackend()
+
+
+def configure(backend: SearchBackend) -> SearchClient:
+    """Переключает общий клиент на другой бэкенд."""
+    global _client
+    with _client_lock:
+        _client = SearchClient(backend)
+        return _client
+
+
+def get_client() -> SearchClient:
+    """Общий на процесс поисковый клиент."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = SearchClient(_backend_from_env())
+        return _client
+
+
+def search(query: str, max_results: int = 10, region: str = DEFAULT_REGION) -> List[str]:
+    return get_client().search(query, max_results=max_results, region=region)
@@ -0,0 +1,127 @@
+"""Реестр официальных сайтов: организация → URL."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+REGISTRY_PATH = os.getenv("AI_SCOUT_SITE_REGISTRY", "site_registry.json")
+TTL = 180 * 24 * 3600            # найденный поиском сайт перепроверяем раз в полгода
+NEGATIVE_TTL = 7 * 24 * 3600     # «сайт не найден» — раз в неделю
+
+
+@dataclass
+class SiteEntry:
+    org:        str
+    url:        str                # '' — поиск ничего не нашёл
+    confidence: float = 0.0
+    source:     str = "search"
+    pinned:     bool = False
+    updated:    float = 0.0        # unix time
+
+    def expired(self, now: float) -> bool:
+        if self.pinned:
+            return False
+        return now - self.updated > (TTL if self.url else NEGATIVE_TTL)
+
+
+def normalize(clean_name: str) -> str:
+    """Ключ реестра: регистр, «ё» и пробелы не важны."""
+    return " ".join(clean_name.casefold().replace("ё", "е").split())
+
+
+class SiteRegistry:
+    """Потокобезопасный JSON-реестр официальных сайтов."""
+
+    def __init__(self, path: str = REGISTRY_PATH) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, SiteEntry] = {}
+        if self.path.exists():
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            self._entries = {k: SiteEntry(**v) for k, v in raw.items()}
+
+    def _save(self) -> None:
+        tmp = self.path.with_suffix(".tmp")
+        data = {k: asdict(v) for k, v in sorted(self._entries.items())}
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def lookup(self, clean_name: str) -> Optional[SiteEntry]:
+        """Актуальная запись или ``None`` (нет / устарела)."""
+        with self._lock:
+            entry = self._entries.get(normalize(clean_name))
+        if entry is None or entry.expired(time.time()):
+            return None
+        return entry
+
+    def put(self, clean_name: str, url: str, confidence: float,
+            source: str = "search", pinned: bool = False) -> None:
+        key = normalize(clean_name)
+        with self._lock:
+            old = self._entries.get(key)
+            if old and old.pinned and not pinned:
+                return                           # ручную запись поиск не перетирает
+            self._entries[key] = SiteEntry(clean_name, url, confidence, source, pinned, time.time())
+            self._save()
+
+    def pin(self, clean_name: str, url: str, source: str = "manual") -> None:
+        self.put(clean_name, url, 1.0, source=source, pinned=True)
+
+    def forget(self, clean_name: str) -> bool:
+        with self._lock:
+            removed = self._entries.pop(normalize(clean_name), None) is not None
+            if removed:
+                self._save()
+        return removed
+
+    def entries(self) -> Dict[str, SiteEntry]:
+        with self._lock:
+            return dict(self._entries)
+
+
+_registry: Optional[SiteRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> SiteRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = SiteRegistry()
+        return _registry
+
+
+def _cli() -> None:
+    from .discover import _clean_name
+
+    parser = argparse.ArgumentParser(prog="python -m ai_scout_lite.site_registry")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    pin = sub.add_parser("pin", help="закрепить URL за организацией")
+    pin.add_argument("org")
+    pin.add_argument("url")
+    forget = sub.add_parser("forget", help="удалить запись")
+    forget.add_argument("org")
+    sub.add_parser("list", help="показать реестр")
+    args = parser.parse_args()
+
+    reg = get_registry()
+    if args.cmd == "pin":
+        reg.pin(_clean_name(args.org), args.url)
+    elif args.cmd == "forget":
+        print("удалено" if reg.forget(_clean_name(args.org)) else "нет такой записи")
+    else:
+        now = time.time()
+        for e in reg.entries().values():
+            flag = "📌" if e.pinned else ("⌛" if e.expired(now) else " ")
+            print(f"{flag} {e.confidence:0.2f} {e.url or '—':40} {e.org}")
+
+
+if __name__ == "__main__":
+    _cli()
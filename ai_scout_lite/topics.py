@@ -5,10 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List
 
-#from langchain.llms import OpenAI
-from langchain_openai import OpenAI
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
+from . import llm_cache
 
 PROMPT_TOPIC_NAME = """
 Назови коротким заголовком (≤7 слов) научную проблему, которую решают
@@ -27,8 +24,10 @@ class Topic:
 
 def generate_topic_name(titles: List[str]) -> str:
     """Создаём название темы при помощи LLM."""
+    from langchain.prompts import PromptTemplate     # langchain — только когда нужен
+    from langchain_openai import OpenAI
+
     llm = OpenAI(temperature=0)
     prompt = PromptTemplate(template=PROMPT_TOPIC_NAME, input_variables=["titles"])
-    chain = LLMChain(prompt=prompt, llm=llm)
-    return chain.run(titles="\n".join(titles))
+    return llm_cache.cached_invoke(prompt, llm, {"titles": "\n".join(titles)})
 
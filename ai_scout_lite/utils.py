@@ -4,7 +4,27 @@ from __future__ import annotations
 
 
 import json, json5, logging, re
-from typing import Any, Dict
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Реальный Firefox UA (июнь-2025)
+FIREFOX_UA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:126.0) "
+    "Gecko/20100101 Firefox/126.0"
+)
+HEADERS = {
+    "User-Agent": FIREFOX_UA,
+    "Accept":
+        "text/html,application/xhtml+xml,"
+        "application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "Accept-Language": "ru,en;q=0.9",
+    "DNT": "1",
+}
 
 def _to_text(obj: Any) -> str:
     """Преобразует вход в строку.
@@ -50,3 +70,21 @@ def extract_json(msg) -> dict:
 
     logging.warning("extract_json: cannot parse JSON after json5 fallback")
     return {}
+
+
+def bounded_map(fn: Callable[[T], R], items: Iterable[T], max_parallel: int) -> Iterator[R]:
+    """
+    Как ``ThreadPoolExecutor.map``, но читает ``items`` лениво:
+    в работе одновременно не больше ``max_parallel`` элементов.
+    Результаты отдаются в исходном порядке. Воркеры видят контекст
+    (``contextvars``) вызывающего потока — например, метрики организации.
+    """
+    max_parallel = max(1, max_parallel)
+    with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+        window: deque = deque()
+        for item in items:
+            window.append(pool.submit(contextvars.copy_context().run, fn, item))
+            if len(window) >= max_parallel:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
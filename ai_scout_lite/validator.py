@@ -5,10 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 import logging
 
-# from langchain.llms import OpenAI
-from langchain_openai import OpenAI
-from langchain.prompts import PromptTemplate
-
+from . import llm_cache
 from .utils import extract_json
 
 PROMPT_VALIDATION = """
@@ -30,10 +27,12 @@ class ValidationResult:
 
 def validate_pilot(pilot_text: str) -> ValidationResult:
     """Запрос к LLM для оценки пилотного проекта."""
+    from langchain.prompts import PromptTemplate     # langchain — только когда нужен
+    from langchain_openai import OpenAI
+
     llm = OpenAI(temperature=0)
     prompt = PromptTemplate(template=PROMPT_VALIDATION, input_variables=["pilot"])
-    chain = prompt | llm
-    result = chain.invoke({"pilot": pilot_text})  # ответ LLM
+    result = llm_cache.cached_invoke(prompt, llm, {"pilot": pilot_text})  # ответ LLM
     data = extract_json(result)
     if data:
         return ValidationResult(
@@ -0,0 +1,65 @@
+"""Проверка: одинаковый сайт — одинаковый текст обхода.
+
+Инкрементальный режим (``discover._unchanged``) сравнивает текст обхода с
+прошлым прогоном; если порядок страниц или точка досрочной остановки
+зависят от того, какая загрузка закончилась раньше, неизменный сайт
+выглядит изменённым и снова уходит в LLM. Скрипт обходит сайт
+:class:`~benchmarks.stubs.StubServer` со случайными задержками страниц
+``--runs`` раз — с досрочной остановкой и без — и сравнивает тексты
+побайтно. Расхождение — код выхода 1::
+
+    python -m benchmarks.determinism
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.stubs import SiteConfig, StubServer  # noqa: E402
+
+
+def crawl_digests(server: StubServer, runs: int, max_pages: int,
+                  enough_chars: int, min_fields: int) -> List[str]:
+    from ai_scout_lite import crawler
+
+    digests = []
+    for _ in range(runs):
+        text = asyncio.run(crawler.crawl(server.site_url(0), max_pages=max_pages,
+                                         enough_chars=enough_chars, min_fields=min_fields))
+        digests.append(hashlib.sha256(text.encode()).hexdigest()[:16])
+    return digests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.determinism")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=12, help="страниц на сайте")
+    parser.add_argument("--jitter", type=float, default=0.05, help="до … сек задержки страницы")
+    args = parser.parse_args()
+
+    config = SiteConfig(orgs=1, pages=args.pages, page_kb=4, site_jitter=args.jitter)
+    problems = []
+    with StubServer(config) as server:
+        os.environ["AI_SCOUT_RATES"] = f"{server.host}=1000:1000"
+        for label, enough_chars in (("до max_pages", 0), ("досрочная остановка", 12_000)):
+            digests = crawl_digests(server, max(2, args.runs), args.pages + 1, enough_chars, 3)
+            print(f"{label:20} {' '.join(digests)}")
+            if len(set(digests)) > 1:
+                problems.append(label)
+    if problems:
+        print("ТЕКСТ ОБХОДА РАЗЛИЧАЕТСЯ: " + ", ".join(problems))
+        sys.exit(1)
+    print("обход детерминирован")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""Сквозной бенчмарк пайплайна на локальных заглушках.
+
+Поднимает :class:`~benchmarks.stubs.StubServer` (синтетические сайты и
+fake-OpenAI с заданной задержкой), направляет поиск в локальный корпус и
+прогоняет этапы:
+
+• ``discover_org`` — по всем организациям, ``--workers`` параллельно;
+• ``crawl_one_level`` и ``_extract_info`` — отдельно, по каждой;
+• ``gather_ai_cases``, ``generate_pilot``, ``validate_pilot``.
+
+Печатает pages/s, orgs/hour, p50/p95 по этапам и пиковый RSS. Результат
+сравнивается с ``benchmarks/baselines.json`` (ключ — ``--scenario``);
+ухудшение больше ``--tolerance`` — код выхода 1. ``--save-baseline``
+записывает текущий прогон как эталон::
+
+    python -m benchmarks.e2e --orgs 4 --pages 10 --llm-latency 0.2
+    python -m benchmarks.e2e --scenario large --orgs 20 --pages 30 --save-baseline
+
+Все кэши выключены, файлы прогона — во временном каталоге; лимиты
+скорости для заглушек сняты (``--real-limits`` — оставить боевые).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, TypeVar
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.stubs import SiteConfig, StubServer, org_name  # noqa: E402
+
+try:
+    import resource
+except ImportError:                      # Windows
+    resource = None
+
+BASELINES = Path(__file__).with_name("baselines.json")
+HIGHER_IS_BETTER = ("pages_per_s", "orgs_per_hour")
+
+T = TypeVar("T")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Перцентиль по ближайшему рангу (``q`` в долях)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def peak_rss_mb() -> Dict[str, Optional[float]]:
+    """Пиковый RSS процесса и самого «тяжёлого» дочернего (пул экстракции)."""
+    if resource is None:
+        return {"self": None, "children": None}
+    scale = 1 if sys.platform == "darwin" else 1024          # ru_maxrss: байты / КБ
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale / 2**20, 1),
+    }
+
+
+class Timings:
+    """Длительности вызовов по этапам."""
+
+    def __init__(self) -> None:
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def time(self, stage: str, fn: Callable[..., T], *args, **kwargs) -> T:
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.samples[stage].append(time.perf_counter() - started)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {
+            stage: {"n": len(v), "p50": round(percentile(v, 0.5), 3),
+                    "p95": round(percentile(v, 0.95), 3)}
+            for stage, v in self.samples.items()
+        }
+
+
+def _configure_env(server: StubServer, workdir: Path, real_limits: bool) -> None:
+    """Переменные окружения читаются модулями при импорте — задаём заранее."""
+    corpus = server.write_corpus(workdir / "corpus.jsonl")
+    os.environ.update({
+        "OPENAI_API_KEY": "sk-bench",
+        "OPENAI_BASE_URL": f"{server.base_url}/v1",
+        "OPENAI_API_BASE": f"{server.base_url}/v1",
+        "AI_SCOUT_SEARCH_BACKEND": f"local:{corpus}",
+        "AI_SCOUT_SEARCH_CACHE": "off",
+        "AI_SCOUT_LLM_CACHE": "off",
+        "AI_SCOUT_SITE_REGISTRY": str(workdir / "site_registry.json"),
+    })
+    if not real_limits:
+        os.environ["AI_SCOUT_RATES"] = f"{server.host}=1000:1000"
+        os.environ["AI_SCOUT_LLM_LIMITS"] = "*=100000000:100000"
+
+
+def run(config: SiteConfig, workers: int, real_limits: bool) -> dict:
+    with tempfile.TemporaryDirectory(prefix="ai_scout_bench_") as tmp, StubServer(config) as server:
+        workdir = Path(tmp)
+        _configure_env(server, workdir, real_limits)
+        os.chdir(workdir)                          # output/ и кэши — во временный каталог
+
+        from ai_scout_lite import cases, discover, extract, pilots, prefilter, validator
+        from trafilatura.settings import DEFAULT_CONFIG
+        # ленивые зависимости этапов грузим заранее, а пул экстракции (forkserver
+        # с trafilatura) запускаем: p50/p95 — про этапы, а не про старт процесса
+        # (время импорта меряет benchmarks.startup)
+        import langchain_openai, openai, pandas  # noqa: E401,F401
+        extract.run(extract.page_text, "<html></html>")
+
+        # заглушки слушают loopback, а новые trafilatura такие адреса блокируют
+        DEFAULT_CONFIG.set("DEFAULT", "SSRF_PROTECTION", "off")
+        discover.console.quiet = True
+        timings = Timings()
+        orgs = [org_name(i) for i in range(config.orgs)]
+        for i, org in enumerate(orgs):
+            discover.pin_official_site(org, server.site_url(i), source="bench")
+
+        # ── discover_org: весь пайплайн организации ──────────────────
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            summaries = list(pool.map(
+                lambda org: timings.time("discover_org", discover.discover_org,
+                                         org, workdir / "output" / org.replace(" ", "_")),
+                orgs,
+            ))
+        discover_wall = time.perf_counter() - started
+        failed = [s.org for s in summaries if not s.ok]
+
+        # ── краулинг и экстракция по отдельности ─────────────────────
+        crawl_seconds, pages_before, texts = 0.0, server.count("site"), []
+        for i in range(config.orgs):
+            started = time.perf_counter()
+            texts.append(timings.time("crawl_one_level", discover.crawl_one_level,
+                                      server.site_url(i), max_pages=config.pages + 1))
+            crawl_seconds += time.perf_counter() - started
+        pages = server.count("site") - pages_before
+        infos = [timings.time("_extract_info", discover._extract_info, t) for t in texts]
+
+        # ── кейсы, пилоты, валидация ─────────────────────────────────
+        for org, info in zip(orgs, infos):
+            tasks = info.science[:2] or ["катализ"]
+            df = timings.time("gather_ai_cases", cases.gather_ai_cases, org, tasks, max_results=3)
+            case_task = df["task"].iloc[0] if len(df) else ""
+            partner = info.partners[0] if info.partners else ""
+            pilot = timings.time("generate_pilot", pilots.generate_pilot,
+                                 org, tasks[0], case_task, partner)
+            timings.time("validate_pilot", validator.validate_pilot, f"{pilot.title}\n{pilot.body}")
+
+        os.chdir(ROOT)
+        return {
+            "pages_per_s": round(pages / crawl_seconds, 1) if crawl_seconds else 0.0,
+            "orgs_per_hour": round(len(orgs) / discover_wall * 3600, 1),
+            "stages": timings.summary(),
+            "peak_rss_mb": peak_rss_mb(),
+            "requests": dict(server.hits),
+            "prefilter": prefilter.get_filter().report(),
+            "failed_orgs": failed,
+        }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Метрики, ухудшившиеся относительно эталона больше чем на ``tolerance``."""
+    regressions = []
+    for key in HIGHER_IS_BETTER:
+        old, new = baseline.get(key), current.get(key)
+        if old and new is not None and new < old * (1 - tolerance):
+            regressions.append(f"{key}: {new} < {old}")
+    for stage, old in baseline.get("stages", {}).items():
+        new = current["stages"].get(stage)
+        if new is None:
+            continue
+        for q in ("p50", "p95"):
+            if old[q] and new[q] > old[q] * (1 + tolerance):
+                regressions.append(f"{stage} {q}: {new[q]} > {old[q]} с")
+    for proc in ("self", "children"):
+        old, new = baseline.get("peak_rss_mb", {}).get(proc), current["peak_rss_mb"].get(proc)
+        if old and new and new > old * (1 + tolerance):
+            regressions.append(f"peak RSS {proc}: {new} > {old} МБ")
+    return regressions
+
+
+def _print(result: dict) -> None:
+    print(f"pages/s:    {result['pages_per_s']}")
+    print(f"orgs/hour:  {result['orgs_per_hour']}")
+    print(f"peak RSS:   {result['peak_rss_mb']['self']} МБ "
+          f"(пул экстракции {result['peak_rss_mb']['children']} МБ)")
+    print(f"requests:   {result['requests']}")
+    print(f"prefilter:  {result['prefilter']}")
+    print(f"{'stage':18} {'n':>4} {'p50, с':>8} {'p95, с':>8}")
+    for stage, s in result["stages"].items():
+        print(f"{stage:18} {s['n']:>4} {s['p50']:>8.3f} {s['p95']:>8.3f}")
+    if result["failed_orgs"]:
+        print(f"failed:     {result['failed_orgs']}")
+
+
+def main() -> None:
+    defaults = SiteConfig()
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.e2e")
+    parser.add_argument("--scenario", default="default", help="имя эталона в baselines.json")
+    parser.add_argument("--orgs", type=int, default=defaults.orgs)
+    parser.add_argument("--pages", type=int, default=defaults.pages, help="страниц на сайте")
+    parser.add_argument("--page-kb", type=int, default=defaults.page_kb)
+    parser.add_argument("--web-pages", type=int, default=defaults.web_pages)
+    parser.add_argument("--llm-latency", type=float, default=defaults.llm_latency,
+                        help="задержка ответа fake-OpenAI, сек")
+    parser.add_argument("--workers", type=int, default=2, help="параллельных discover_org")
+    parser.add_argument("--real-limits", action="store_true",
+                        help="не снимать лимиты скорости для заглушек")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="допустимое ухудшение относительно эталона (доля)")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    config = SiteConfig(orgs=args.orgs, pages=args.pages, page_kb=args.page_kb,
+                        web_pages=args.web_pages, llm_latency=args.llm_latency)
+    result = run(config, args.workers, args.real_limits)
+    result["config"] = {**asdict(config), "workers": args.workers, "real_limits": args.real_limits}
+    result["machine"] = f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPU, " \
+                        f"Python {platform.python_version()}"
+    _print(result)
+
+    baselines = json.loads(BASELINES.read_text(encoding="utf-8")) if BASELINES.exists() else {}
+    if args.save_baseline:
+        baselines[args.scenario] = result
+        BASELINES.write_text(json.dumps(baselines, ensure_ascii=False, indent=2) + "\n",
+                             encoding="utf-8")
+        print(f"эталон «{args.scenario}» сохранён в {BASELINES}")
+        return
+
+    baseline = baselines.get(args.scenario)
+    if baseline is None:
+        print(f"эталона «{args.scenario}» нет — запустите с --save-baseline")
+        return
+    if baseline.get("config") != result["config"]:
+        print("⚠ параметры прогона отличаются от эталона — сравнение приблизительное")
+    regressions = compare(result, baseline, args.tolerance)
+    if regressions:
+        print("РЕГРЕССИИ:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+    print(f"без регрессий относительно «{args.scenario}» (допуск {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
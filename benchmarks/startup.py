@@ -0,0 +1,95 @@
+"""Бюджет времени импорта: ``python -X importtime`` по точкам входа.
+
+Каждый запуск ``main.py`` и каждый процесс-воркер сначала импортирует
+пакет; тяжёлые зависимости (langchain, OpenAI SDK, Selenium, pandas)
+грузятся только в функциях своих этапов. Скрипт
+импортирует модули из :data:`BUDGETS_MS` в чистом интерпретаторе
+(``--repeat`` раз, берётся минимум), сравнивает кумулятивное время с
+бюджетом и проверяет, что модули из :data:`LAZY` при этом не загружены.
+Нарушение — код выхода 1::
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --scale 2      # медленная машина / CI
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# модуль → бюджет, мс (кумулятивно, с зависимостями)
+BUDGETS_MS: Dict[str, int] = {
+    "main":                    700,
+    "ai_scout_lite.discover":  650,
+    "ai_scout_lite.cases":     550,
+    "ai_scout_lite.partners":  200,
+    "ai_scout_lite.pilots":    200,
+    "ai_scout_lite.validator": 200,
+    "ai_scout_lite.topics":    200,
+    "ai_scout_lite.extract":   500,
+}
+# не должны импортироваться ни одной точкой входа
+LAZY = ("langchain", "langchain_openai", "openai", "pandas", "selenium",
+        "webdriver_manager", "duckduckgo_search")
+
+
+def import_profile(module: str) -> Tuple[float, List[str]]:
+    """Кумулятивное время импорта ``module`` (мс) и список загруженных модулей."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if proc.returncode:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    total, loaded = 0.0, []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():               # строка-заголовок
+            continue
+        loaded.append(name.strip())
+        if name.strip() == module:
+            total = int(cumulative) / 1000
+    return total, loaded
+
+
+def check(repeat: int, scale: float) -> List[str]:
+    problems = []
+    print(f"{'module':26} {'ms':>7} {'budget':>7}")
+    for module, budget in BUDGETS_MS.items():
+        runs = [import_profile(module) for _ in range(repeat)]
+        ms = min(t for t, _ in runs)
+        limit = budget * scale
+        mark = "" if ms <= limit else "  ← превышен"
+        print(f"{module:26} {ms:>7.0f} {limit:>7.0f}{mark}")
+        if mark:
+            problems.append(f"{module}: {ms:.0f} мс > {limit:.0f} мс")
+        eager = [lazy for lazy in LAZY if lazy in runs[0][1]]
+        if eager:
+            problems.append(f"{module} загружает при импорте: {', '.join(eager)}")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup")
+    parser.add_argument("--repeat", type=int, default=3, help="прогонов на модуль (берётся минимум)")
+    parser.add_argument("--scale", type=float, default=1.0, help="множитель бюджетов")
+    args = parser.parse_args()
+
+    problems = check(max(1, args.repeat), args.scale)
+    if problems:
+        print("НАРУШЕНИЯ:\n  " + "\n  ".join(problems))
+        sys.exit(1)
+    print("импорт укладывается в бюджет")
+
+
+if __name__ == "__main__":
+    main()
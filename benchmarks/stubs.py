@@ -0,0 +1,232 @@
+"""Локальные заглушки для бенчмарка: синтетические сайты и OpenAI-совместимый API.
+
+Один :class:`StubServer` (``ThreadingHTTPServer`` в фоновом потоке) отдаёт:
+
+• ``/site/<i>/`` и ``/site/<i>/p<j>.html`` — «официальный сайт» института
+  ``i``: главная со ссылками на ``pages`` страниц по ≈``page_kb`` КБ;
+• ``/web/<i>/<k>.html`` — сторонние публикации об институте (новости,
+  AI-кейсы) для поиска по локальному корпусу;
+• ``POST /v1/chat/completions`` и ``POST /v1/completions`` — ответы в
+  формате OpenAI с задержкой ``llm_latency`` сек.
+
+Тексты детерминированы (``seed``), абзацы внутри сайта разные, поэтому
+дедупликация и LLM-экстракция работают как на реальных данных.
+:meth:`StubServer.write_corpus` пишет JSONL-корпус для
+:class:`ai_scout_lite.search.LocalBackend`.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Tuple
+
+_WORDS = (
+    "исследование лаборатория катализ синтез полимер материал структура "
+    "спектроскопия моделирование эксперимент реактор мембрана наночастица "
+    "кристалл анализ данные измерение установка грант проект партнёр "
+    "предприятие внедрение технология разработка метод образец результат "
+    "публикация журнал конференция сотрудник аспирант отдел институт"
+).split()
+_AI_WORDS = "нейросеть машинное обучение модель прогноз классификация".split()
+
+ORG_TEMPLATE = "Институт синтетической химии №{i}"
+
+
+def org_name(i: int) -> str:
+    return ORG_TEMPLATE.format(i=i)
+
+
+def _paragraph(rng: random.Random, words: int, extra: Tuple[str, ...] = ()) -> str:
+    vocab = _WORDS + list(extra)
+    body = " ".join(rng.choice(vocab) for _ in range(words))
+    return body[:1].upper() + body[1:] + "."
+
+
+@dataclass
+class SiteConfig:
+    orgs:        int = 4
+    pages:       int = 10        # страниц 1-го уровня на сайте
+    page_kb:     int = 8         # ≈ размер текста страницы
+    web_pages:   int = 5         # сторонних публикаций на организацию
+    llm_latency: float = 0.2     # сек на ответ fake-OpenAI
+    site_jitter: float = 0.0     # случайная задержка страницы сайта, до … сек
+    seed:        int = 1
+
+
+class StubServer:
+    """Синтетические сайты + fake-OpenAI на ``127.0.0.1:<port>``."""
+
+    def __init__(self, config: SiteConfig) -> None:
+        self.config = config
+        self.hits: Dict[str, int] = {"site": 0, "web": 0, "llm": 0}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    # ── жизненный цикл ───────────────────────────────────────────────
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    @property
+    def host(self) -> str:
+        return f"127.0.0.1:{self._httpd.server_address[1]}"
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def count(self, kind: str) -> int:
+        with self._lock:
+            return self.hits[kind]
+
+    def _hit(self, kind: str) -> None:
+        with self._lock:
+            self.hits[kind] += 1
+
+    # ── контент ──────────────────────────────────────────────────────
+    def site_url(self, i: int) -> str:
+        return f"{self.base_url}/site/{i}/"
+
+    def _page(self, i: int, j: int) -> str:
+        rng = random.Random(f"{self.config.seed}-site-{i}-{j}")
+        paras, size = [], 0
+        while size < self.config.page_kb * 1024:
+            p = _paragraph(rng, rng.randint(30, 60))
+            paras.append(p)
+            size += len(p.encode())
+        links = "".join(
+            f'<li><a href="/site/{i}/p{k}.html">Раздел {k}</a></li>'
+            for k in range(self.config.pages)
+        )
+        body = "".join(f"<p>{p}</p>" for p in paras)
+        title = org_name(i) if j < 0 else f"{org_name(i)} — раздел {j}"
+        return (f"<html><head><meta charset='utf-8'><title>{title}</title></head>"
+                f"<body><nav><ul>{links}</ul></nav><article><h1>{title}</h1>{body}"
+                f"</article><footer>© {org_name(i)}</footer></body></html>")
+
+    def _web_text(self, i: int, k: int) -> Tuple[str, str]:
+        rng = random.Random(f"{self.config.seed}-web-{i}-{k}")
+        title = f"{org_name(i)}: новости, результаты и партнеры исследования {k}"
+        extra = tuple(_AI_WORDS) if k % 2 == 0 else ()
+        paras = [_paragraph(rng, rng.randint(40, 80), extra) for _ in range(6)]
+        return title, "\n".join(paras)
+
+    def _web_page(self, i: int, k: int) -> str:
+        title, text = self._web_text(i, k)
+        body = "".join(f"<p>{p}</p>" for p in text.split("\n"))
+        return (f"<html><head><meta charset='utf-8'><title>{title}</title></head>"
+                f"<body><article><h1>{title}</h1>{body}</article></body></html>")
+
+    def write_corpus(self, path: Path) -> Path:
+        """JSONL-корпус для локального поиска: сайты и сторонние страницы."""
+        with open(path, "w", encoding="utf-8") as fh:
+            for i in range(self.config.orgs):
+                fh.write(json.dumps({"url": self.site_url(i), "title": org_name(i),
+                                     "text": f"{org_name(i)} официальный сайт"},
+                                    ensure_ascii=False) + "\n")
+                for k in range(self.config.web_pages):
+                    title, text = self._web_text(i, k)
+                    fh.write(json.dumps({"url": f"{self.base_url}/web/{i}/{k}.html",
+                                         "title": title, "text": text},
+                                        ensure_ascii=False) + "\n")
+        return path
+
+    # ── fake-OpenAI ──────────────────────────────────────────────────
+    @staticmethod
+    def _completion_text(prompt: str) -> str:
+        if "успешный кейс" in prompt:
+            hit = any(w in prompt for w in _AI_WORDS)
+            return json.dumps({"is_ai_case": hit, "task": "прогноз свойств материалов",
+                               "ai_method": "машинное обучение", "kpi": "−30 % времени"},
+                              ensure_ascii=False)
+        if "Оцени" in prompt:
+            return '{"acceptable": true, "reason": "соответствует критериям"}'
+        return ("Пилот: ML-прогноз свойств катализаторов\n"
+                "• Problem: долгий подбор\n• AI Solution: модель\n"
+                "• Partner: предприятие\n• Expected Impact: −30 % времени")
+
+    @staticmethod
+    def _org_info(text: str) -> str:
+        rng = random.Random(len(text))
+        pick = lambda n: [" ".join(rng.sample(_WORDS, 3)) for _ in range(n)]  # noqa: E731
+        return json.dumps({"science": pick(4), "activities": pick(3), "results": pick(3),
+                           "commercial": pick(1), "partners": pick(2)}, ensure_ascii=False)
+
+    def _llm(self, path: str, request: dict) -> dict:
+        time.sleep(self.config.llm_latency)
+        model = request.get("model", "stub")
+        if path.endswith("/chat/completions"):
+            prompt = "\n".join(str(m.get("content", "")) for m in request.get("messages", []))
+            message = {"role": "assistant", "content": None,
+                       "function_call": {"name": "extract_org_info",
+                                         "arguments": self._org_info(prompt)}}
+            choice = {"index": 0, "message": message, "finish_reason": "function_call"}
+            kind, out = "chat.completion", message["function_call"]["arguments"]
+        else:
+            prompt = request.get("prompt", "")
+            prompt = "\n".join(prompt) if isinstance(prompt, list) else prompt
+            out = self._completion_text(prompt)
+            choice = {"index": 0, "text": out, "logprobs": None, "finish_reason": "stop"}
+            kind = "text_completion"
+        usage = {"prompt_tokens": len(prompt) // 3, "completion_tokens": len(out) // 3}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        return {"id": "bench", "object": kind, "created": int(time.time()),
+                "model": model, "choices": [choice], "usage": usage}
+
+    # ── HTTP ─────────────────────────────────────────────────────────
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:      # тишина в консоли
+                pass
+
+            def _send(self, status: int, body: bytes, ctype: str) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                parts = self.path.split("?")[0].strip("/").split("/")
+                try:
+                    if parts[0] == "site" and len(parts) in (2, 3):
+                        i = int(parts[1])
+                        j = int(parts[2][1:].split(".")[0]) if len(parts) == 3 else -1
+                        html, kind = server._page(i, j), "site"
+                    elif parts[0] == "web" and len(parts) == 3:
+                        html, kind = server._web_page(int(parts[1]), int(parts[2].split(".")[0])), "web"
+                    else:
+                        raise ValueError(self.path)
+                except (ValueError, IndexError):
+                    self._send(404, b"not found", "text/plain")
+                    return
+                server._hit(kind)
+                if kind == "site" and server.config.site_jitter:
+                    time.sleep(random.random() * server.config.site_jitter)
+                self._send(200, html.encode(), "text/html; charset=utf-8")
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                server._hit("llm")
+                reply = server._llm(self.path, request)
+                self._send(200, json.dumps(reply, ensure_ascii=False).encode(),
+                           "application/json")
+
+        return Handler
@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
-from ai_scout_lite.discover import discover_org
+from ai_scout_lite.discover import discover_org, OrgSummary, console
+from ai_scout_lite.manifest import Manifest, OrgProgress
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import logging
+import os
 from pathlib import Path
-import time                 # ← добавьте
-import random
+import time
 
-from ai_scout_lite import discover, cases, partners, pilots, validator
+from ai_scout_lite import discover, ratelimit, llm_cache
+from ai_scout_lite import crawl_state, llm_budget, metrics, prefilter, results, search
 
 ORG_NAMES = [
         "Институт металлоорганической химии им. Г.А. Разуваева",
@@ -18,6 +22,38 @@ ORG_NAMES = [
         # добавьте сколько нужно
     ]
 
+
+def _parse_org_line(line: str) -> tuple[str, str]:
+    """«Название» или «Название;URL» (также через таб или запятую)."""
+    for sep in ("\t", ";", ","):
+        name, _, url = line.rpartition(sep)
+        if name and url.strip().startswith(("http://", "https://")):
+            return name.strip(), url.strip()
+    return line, ""
+
+
+def _run_one(org: str, output_root: Path, progress: OrgProgress) -> OrgSummary:
+    """Обработка одной организации; ошибка не роняет весь батч."""
+    started = time.monotonic()
+    with metrics.track(org) as m:
+        try:
+            return discover_org(org, output_root / org.replace(" ", "_"), progress)
+        except Exception as exc:  # noqa: BLE001
+            m.ok = False
+            return OrgSummary(org=org, ok=False, seconds=time.monotonic() - started,
+                              error=f"{type(exc).__name__}: {exc}")
+
+
+def _report(summary: OrgSummary, done: int, total: int) -> None:
+    """Печатает итог по организации сразу, как только она готова."""
+    head = f"[{done}/{total}] {summary.org} — {summary.seconds:0.0f} с"
+    if summary.ok:
+        console.print(f"[bold green]✔ {head}[/]: сайт {summary.site_items} п., "
+                      f"интернет {summary.web_items} п., "
+                      f"дедупликация −{summary.saved_tokens:,} токенов")
+    else:
+        console.print(f"[bold red]✖ {head}[/]: {summary.error}")
+
 def main() -> None:
     """
     Запускает discover-пайплайн для всех организаций из ORG_NAMES.
@@ -27,29 +63,107 @@ def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "--org-file",
-        help="Путь к .txt/.csv со списком организаций (по одной строке)",
+        help="Путь к .txt/.csv со списком организаций (по одной строке; "
+             "после ';', таба или ',' можно указать URL официального сайта)",
     )
     parser.add_argument(
         "--out",
         default="output",
         help="Каталог, куда складываются результаты",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Сколько организаций обрабатывать параллельно",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Продолжить прерванный прогон: пропустить готовые этапы из run_manifest.json",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Повторный скан: условные запросы (ETag/Last-Modified), LLM только для изменившихся",
+    )
+    parser.add_argument(
+        "--search-corpus",
+        help="Искать по локальному корпусу JSONL (url/title/text) вместо DuckDuckGo",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Отдавать метрики в формате Prometheus на http://127.0.0.1:<порт>/metrics",
+    )
     args = parser.parse_args()
+    if not os.getenv("OPENAI_API_KEY"):
+        logging.warning("Переменная OPENAI_API_KEY не задана — вызовы LLM не пройдут")
+    if args.search_corpus:
+        search.configure(search.LocalBackend(args.search_corpus))
 
     # ── откуда берём список организаций ───────────────────────────────
     org_list = ORG_NAMES
     if args.org_file:                               # если указан файл
         with open(args.org_file, encoding="utf-8") as fh:
-            org_list = [line.strip() for line in fh if line.strip()]
+            rows = [_parse_org_line(line.strip()) for line in fh if line.strip()]
+        org_list = [name for name, _ in rows]
+        for name, url in rows:                      # URL из файла → реестр сайтов
+            if url:
+                discover.pin_official_site(name, url, source="org-file")
 
     output_root = Path(args.out)
     output_root.mkdir(exist_ok=True)
+    if args.incremental:
+        crawl_state.enable(str(output_root / "crawl_state.sqlite"))
+    metrics.configure(output_root / "metrics.jsonl")      # строка JSON на организацию
+    store = results.enable(output_root / results.STORE_PATH, resume=args.resume)
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+
+    # ── манифест этапов: без --resume начинаем каждую организацию заново
+    manifest = Manifest(output_root / "run_manifest.json")
+    progress = {org: manifest.progress(org) for org in org_list}
+    if args.resume:
+        finished = [org for org in org_list if progress[org].complete]
+        if finished:
+            console.print(f"[dim]↺ --resume: {len(finished)} организаций уже готовы[/]")
+        org_list = [org for org in org_list if not progress[org].complete]
+    else:
+        for p in progress.values():
+            p.reset()
 
     # ── основной цикл ─────────────────────────────────────────────────
-    for org in org_list:
-        discover_org(org, output_root / org.replace(" ", "_"))
-        # «честная» пауза, чтобы не ловить ratelimit DDG
-        time.sleep(3 + random.uniform(0, 2))
+    # темп запросов к поиску и сайтам держат общие лимитеры (ratelimit,
+    # search.SearchClient), поэтому потоки можно запускать без sleep между организациями
+    total = len(org_list)
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = [pool.submit(_run_one, org, output_root, progress[org]) for org in org_list]
+        for done, fut in enumerate(as_completed(futures), 1):
+            _report(fut.result(), done, total)
+
+    for key, st in sorted(ratelimit.stats().items()):
+        if st.throttled:
+            console.print(f"[dim]rate-limit {key}: {st.throttled}/{st.calls} "
+                          f"запросов ждали, всего {st.waited:0.1f} с[/]")
+    search_stats = search.get_client().stats
+    console.print(f"[dim]поиск: {search_stats.hits} из кэша, {search_stats.misses} запросов, "
+                  f"{search_stats.shared} склеено[/]")
+    cache_stats = llm_cache.get_cache().stats
+    console.print(f"[dim]LLM-кэш: {cache_stats.hits} попаданий, {cache_stats.misses} промахов "
+                  f"({cache_stats.hit_rate:0.0%})[/]")
+    for model, u in llm_budget.get_scheduler().report().items():
+        console.print(f"[dim]LLM {model}: {u.requests} вызовов, токены {u.tokens_in:,}→"
+                      f"{u.tokens_out:,} (оценка {u.estimated:,}), ${u.cost:0.4f}; "
+                      f"в очереди {u.queued} ({u.queued_seconds:0.1f} с), "
+                      f"понижений {u.downgrades}, ошибок {u.failed}[/]")
+    if prefilter.get_filter().stats.pages:
+        console.print(f"[dim]{prefilter.get_filter().report()}[/]")
+    for stage, st in metrics.total().stages.items():
+        console.print(f"[dim]{stage}: {st.calls} вызовов за {st.seconds:0.1f} с, "
+                      f"{st.bytes / 2**20:0.1f} МБ, токены {st.tokens_in:,}→{st.tokens_out:,}[/]")
+    console.print(f"[dim]итоги: {store.path}, прогон {store.run_id} — отчёты и выгрузка: "
+                  f"python -m ai_scout_lite.results --db {store.path} report --all --dir <каталог>[/]")
 
 
     # console.print("[bold]Ищем AI-кейсы...")